@@ -1,11 +1,52 @@
-from google.adk.agents import LlmAgent
-from tools import consult_flight_specialist, consult_lifestyle_specialist
+from functools import lru_cache
 import config
 
-# Define Root Agent (Nomad) with wrapper tools for Live API
-nomad_agent = LlmAgent(
-    name="Nomad",
-    model=config.ORCHESTRATOR_MODEL,
-    instruction=config.NOMAD_INSTRUCTION,
-    tools=[consult_flight_specialist, consult_lifestyle_specialist]  # Wrapper tools for subagents
-)
\ No newline at end of file
+
+# The root agent is built on first use so importing this module stays cheap (see warmup.py)
+@lru_cache(maxsize=None)
+def get_nomad_agent():
+    """Creates the root agent (Nomad) with wrapper tools for the Live API."""
+    from google.adk.agents import LlmAgent
+    from tools import (
+        consult_flight_specialist, consult_lifestyle_specialist,
+        stream_flight_specialist, stream_lifestyle_specialist,
+        compare_travel_options
+    )
+
+    # Wrapper tools for subagents (streaming variants surface partial results to the Live model)
+    if config.STREAMING_SPECIALISTS:
+        orchestrator_tools = [stream_flight_specialist, stream_lifestyle_specialist, compare_travel_options]
+        orchestrator_instruction = config.NOMAD_INSTRUCTION + config.STREAMING_INSTRUCTION_ADDENDUM
+    else:
+        orchestrator_tools = [consult_flight_specialist, consult_lifestyle_specialist, compare_travel_options]
+        orchestrator_instruction = config.NOMAD_INSTRUCTION
+
+    return LlmAgent(
+        name="Nomad",
+        # The Live API talks over its own websocket, so the orchestrator doesn't use a pooled HTTP client
+        model=config.ORCHESTRATOR_MODEL,
+        instruction=orchestrator_instruction,
+        tools=orchestrator_tools
+    )
+
+
+@lru_cache(maxsize=None)
+def get_text_agent():
+    """Text-mode variant of Nomad for the SSE endpoint: same instruction and (non-streaming) tools, text model."""
+    from google.adk.agents import LlmAgent
+    from client_pool import get_model
+    from tools import consult_flight_specialist, consult_lifestyle_specialist, compare_travel_options
+
+    return LlmAgent(
+        name="Nomad",
+        model=get_model(config.TEXT_MODEL, pool="text"),
+        instruction=config.NOMAD_INSTRUCTION,
+        tools=[consult_flight_specialist, consult_lifestyle_specialist, compare_travel_options]
+    )
+
+
+def __getattr__(name):
+    # Backwards compatible module attribute (nomad_agent)
+    if name == "nomad_agent":
+        return get_nomad_agent()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
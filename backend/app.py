@@ -4,11 +4,23 @@ from dotenv import load_dotenv
 # Load environment variables first
 load_dotenv(override=True)
 
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
-from session_manager import SessionManager
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import BaseModel
+from typing import Optional
+import warmup
 
-app = FastAPI(title="Nomad: The Dreamstream Planner")
+# Heavy modules (google.adk, session_manager, agents) are imported by the background warm-up
+# task and lazily inside handlers, so the server binds and answers /healthz right away.
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    warmup.start()
+    yield
+
+app = FastAPI(title="Nomad: The Dreamstream Planner", lifespan=lifespan)
 
 # CORS configuration
 app.add_middleware(
@@ -19,13 +31,117 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.get("/healthz")
+async def healthz():
+    """Liveness: the process is up (warm-up may still be running)."""
+    return {"status": "ok"}
+
+@app.get("/ready")
+async def ready():
+    """Readiness: 200 only once warm-up has loaded the ADK and built the agents."""
+    status = warmup.status()
+    return JSONResponse(status, status_code=200 if status["ready"] else 503)
+
+@app.get("/debug/memory")
+async def debug_memory():
+    """Per-session memory estimates for all live sessions."""
+    if not warmup.is_ready():
+        return {"active_sessions": 0, "total_event_bytes": 0, "sessions": []}
+    from session_manager import ACTIVE_SESSIONS
+
+    sessions = [manager.memory_report() for manager in list(ACTIVE_SESSIONS.values())]
+    return {
+        "active_sessions": len(sessions),
+        "total_event_bytes": sum(s["event_bytes"] for s in sessions),
+        "sessions": sessions,
+    }
+
+@app.get("/debug/context")
+async def debug_context():
+    """Turn latency versus session length, across all live sessions."""
+    if not warmup.is_ready():
+        return {"turns": 0, "latency_by_session_length": []}
+    from session_manager import ACTIVE_SESSIONS
+    from context_compaction import latency_by_session_length
+
+    samples = []
+    for manager in list(ACTIVE_SESSIONS.values()):
+        samples.extend(manager.turn_latencies)
+    return {
+        "turns": len(samples),
+        "latency_by_session_length": latency_by_session_length(samples),
+    }
+
+@app.get("/debug/connections")
+async def debug_connections():
+    """Connection reuse metrics for the shared GenAI client pools."""
+    if not warmup.is_ready():
+        return {"pools": {}}
+    from client_pool import connection_metrics
+
+    return connection_metrics()
+
+@app.get("/debug/rate_limits")
+async def debug_rate_limits():
+    """Token bucket state for every model and tool bucket."""
+    if not warmup.is_ready():
+        return {}
+    from rate_limiter import rate_limit_status
+
+    return rate_limit_status()
+
+@app.get("/debug/audio_cache")
+async def debug_audio_cache():
+    """Precomputed snippet cache contents and hit rate."""
+    if not warmup.is_ready():
+        return {}
+    from audio_cache import get_audio_cache
+
+    cache = get_audio_cache()
+    return cache.stats() if cache else {"entries": 0, "built": False}
+
+@app.get("/debug/turn_taking")
+async def debug_turn_taking():
+    """Measured pauses, false endpoints and applied / recommended activity detection per live session."""
+    if not warmup.is_ready():
+        return {"sessions": []}
+    from session_manager import ACTIVE_SESSIONS
+
+    return {
+        "sessions": [
+            {"session_id": session_id, "user_id": manager.user_id, **manager.endpointing.report()}
+            for session_id, manager in list(ACTIVE_SESSIONS.items())
+        ]
+    }
+
+class TextChatRequest(BaseModel):
+    message: str
+    session_id: Optional[str] = None
+    user_id: str = "text_user"
+
+@app.post("/chat/stream")
+async def chat_stream(request: TextChatRequest):
+    """Text-only chat streamed as Server-Sent Events (no Live audio session)."""
+    await warmup.wait_until_ready()
+    from text_chat import stream_text_chat
+
+    return StreamingResponse(
+        stream_text_chat(request.message, request.session_id, request.user_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 @app.websocket("/ws/chat")
 async def websocket_endpoint(websocket: WebSocket):
     await websocket.accept()
     print("DEBUG: WebSocket connection accepted")
-    
-    manager = SessionManager(websocket)
+
     try:
+        # Connections arriving during warm-up wait for it rather than importing on the request path
+        await warmup.wait_until_ready()
+        from session_manager import SessionManager
+
+        manager = SessionManager(websocket)
         await manager.start()
     except WebSocketDisconnect:
         print("DEBUG: WebSocket disconnected")
@@ -39,4 +155,4 @@ async def websocket_endpoint(websocket: WebSocket):
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run("app:app", host="0.0.0.0", port=8000, reload=True)
+    uvicorn.run("app:app", host="0.0.0.0", port=8000, reload=True, timeout_keep_alive=30)
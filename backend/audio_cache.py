@@ -0,0 +1,153 @@
+"""
+Precomputed response snippets.
+Short PCM clips (24kHz, 16-bit mono - the Live API's output format) and their text, keyed by normalized
+intent and voice, stored in a memory-mapped slab file so they can be played without a model turn.
+
+Layout: the data file is AUDIO_CACHE_MAX_BYTES split into fixed AUDIO_CACHE_SLOT_BYTES slots, one clip per slot.
+A JSON sidecar (<path>.json) holds the index. When every slot is taken, a new clip evicts the least recently
+used (AUDIO_CACHE_EVICTION = "lru") or least often used ("lfu") entry.
+"""
+
+import json
+import mmap
+import os
+import re
+import threading
+import time
+from functools import lru_cache
+from typing import Any, Dict, NamedTuple, Optional
+import config
+
+
+class CachedSnippet(NamedTuple):
+    audio: memoryview  # Zero-copy view into the mapped file
+    text: str
+
+
+def normalize_intent(intent: str) -> str:
+    """Lowercase words joined by underscores, e.g. "Flight ack!" -> "flight_ack"."""
+    return "_".join(re.findall(r"[a-z0-9]+", (intent or "").lower()))
+
+
+def cache_key(intent: str, voice: str) -> str:
+    return f"{normalize_intent(voice)}:{normalize_intent(intent)}"
+
+
+class AudioCache:
+    def __init__(self, path: str, max_bytes: int, slot_bytes: int, eviction: str = "lru"):
+        if eviction not in ("lru", "lfu"):
+            raise ValueError(f"Unknown eviction policy: {eviction}")
+        self.path = path
+        self.index_path = path + ".json"
+        self.slot_bytes = slot_bytes
+        self.slots = max(1, max_bytes // slot_bytes)
+        self.eviction = eviction
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        if os.path.exists(self.index_path):
+            with open(self.index_path) as f:
+                index = json.load(f)
+            # A different slot layout makes the stored offsets meaningless
+            if index.get("slot_bytes") == slot_bytes:
+                self.entries = {
+                    key: entry for key, entry in index.get("entries", {}).items() if entry["slot"] < self.slots
+                }
+
+        size = self.slots * slot_bytes
+        mode = "r+b" if os.path.exists(path) else "w+b"
+        self._file = open(path, mode)
+        if os.path.getsize(path) != size:
+            self._file.truncate(size)
+        self._map = mmap.mmap(self._file.fileno(), size)
+
+    def get(self, intent: str, voice: str) -> Optional[CachedSnippet]:
+        key = cache_key(intent, voice)
+        with self._lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            entry["hits"] += 1
+            entry["last_used"] = time.time()
+            start = entry["slot"] * self.slot_bytes
+            audio = memoryview(self._map)[start:start + entry["length"]]
+        return CachedSnippet(audio, entry["text"])
+
+    def put(self, intent: str, voice: str, pcm: bytes, text: str) -> bool:
+        """Stores a clip (replacing any previous one for the key). Clips longer than a slot are rejected."""
+        if len(pcm) > self.slot_bytes:
+            return False
+        key = cache_key(intent, voice)
+        with self._lock:
+            if key in self.entries:
+                slot = self.entries[key]["slot"]
+            else:
+                slot = self._free_slot()
+            start = slot * self.slot_bytes
+            self._map[start:start + len(pcm)] = pcm
+            self.entries[key] = {
+                "slot": slot, "length": len(pcm), "text": text,
+                "hits": 0, "last_used": time.time(),
+            }
+        return True
+
+    def _free_slot(self) -> int:
+        used = {entry["slot"] for entry in self.entries.values()}
+        for slot in range(self.slots):
+            if slot not in used:
+                return slot
+        field = "last_used" if self.eviction == "lru" else "hits"
+        victim = min(self.entries, key=lambda key: (self.entries[key][field], self.entries[key]["last_used"]))
+        return self.entries.pop(victim)["slot"]
+
+    def flush(self):
+        """Writes clips and the index to disk (the index is replaced atomically)."""
+        with self._lock:
+            self._map.flush()
+            tmp_path = self.index_path + ".tmp"
+            with open(tmp_path, "w") as f:
+                json.dump({"slot_bytes": self.slot_bytes, "entries": self.entries}, f)
+            os.replace(tmp_path, self.index_path)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self.entries),
+                "slots": self.slots,
+                "slot_bytes": self.slot_bytes,
+                "eviction": self.eviction,
+                "hits": self.hits,
+                "misses": self.misses,
+                "keys": sorted(self.entries),
+            }
+
+
+def is_built(path: Optional[str] = None) -> bool:
+    """Whether build_audio_cache.py has stored any clips at path (without creating or mapping anything)."""
+    path = path or config.AUDIO_CACHE_PATH
+    if not os.path.exists(path) or not os.path.exists(path + ".json"):
+        return False
+    try:
+        with open(path + ".json") as f:
+            return bool(json.load(f).get("entries"))
+    except ValueError:
+        return False
+
+
+def open_audio_cache() -> AudioCache:
+    """Opens (creating if needed) the configured cache file. Used by build_audio_cache.py."""
+    return AudioCache(config.AUDIO_CACHE_PATH, config.AUDIO_CACHE_MAX_BYTES,
+                      config.AUDIO_CACHE_SLOT_BYTES, config.AUDIO_CACHE_EVICTION)
+
+
+@lru_cache(maxsize=None)
+def get_audio_cache() -> Optional[AudioCache]:
+    """
+    The process-wide snippet cache, mapped on first use. None until build_audio_cache.py has stored clips
+    (so an unbuilt cache never creates the slab file); restart the server after building.
+    """
+    return open_audio_cache() if is_built() else None
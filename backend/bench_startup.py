@@ -0,0 +1,64 @@
+"""
+Startup benchmark: import time of app.py and time-to-ready (warm-up finished) in fresh interpreters.
+
+Usage:
+    python bench_startup.py [--runs 5]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Runs in a fresh interpreter; prints JSON timings
+PROBE = """
+import json, time
+t0 = time.perf_counter()
+import app
+t_import = time.perf_counter() - t0
+import warmup
+warmup.warm_up()
+t_ready = time.perf_counter() - t0
+print(json.dumps({"import_app": t_import, "time_to_ready": t_ready, "timings": warmup._state["timings"]}))
+"""
+
+
+def run_once() -> dict:
+    output = subprocess.run(
+        [sys.executable, "-c", PROBE], cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark app import time and time-to-ready.")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    runs = [run_once() for _ in range(args.runs)]
+    report = {
+        "runs": args.runs,
+        "import_app_median": statistics.median(r["import_app"] for r in runs),
+        "time_to_ready_median": statistics.median(r["time_to_ready"] for r in runs),
+        "timings_median": {
+            name: statistics.median(r["timings"][name] for r in runs) for name in runs[0]["timings"]
+        },
+    }
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    print(f"import app:    {report['import_app_median'] * 1000:.1f}ms (median of {args.runs})")
+    print(f"time to ready: {report['time_to_ready_median'] * 1000:.1f}ms")
+    for name, seconds in report["timings_median"].items():
+        print(f"  {name:<32} {seconds * 1000:.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
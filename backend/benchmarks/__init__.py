@@ -0,0 +1,7 @@
+"""
+Micro-benchmarks for the backend hot paths.
+
+Usage (from backend/):
+    python -m benchmarks run [--filter process_event] [--save benchmarks/baselines/baseline.json]
+    python -m benchmarks compare [benchmarks/baselines/baseline.json] [--threshold 0.2]
+"""
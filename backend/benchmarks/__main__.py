@@ -0,0 +1,104 @@
+"""
+Command line for the benchmark suite.
+
+    python -m benchmarks run [--filter NAME] [--save PATH] [--json]
+    python -m benchmarks compare [BASELINE] [--current PATH] [--threshold 0.2] [--filter NAME]
+
+`compare` runs the suite (or loads --current) and exits 1 if any benchmark's median time per call is more than
+--threshold slower than the baseline.
+"""
+
+import argparse
+import json
+import os
+import sys
+from benchmarks import bench_session, bench_tools  # noqa: F401 (registers the benchmarks)
+from benchmarks.harness import compare, run_all
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines", "baseline.json")
+
+
+def _save(report: dict, path: str):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+    print(f"Saved {len(report['results'])} results to {path}", file=sys.stderr)
+
+
+def cmd_run(args):
+    report = run_all(args.filter)
+    if args.save:
+        _save(report, args.save)
+    if args.json:
+        print(json.dumps(report, indent=2, sort_keys=True))
+        return 0
+
+    print(f"{'benchmark':<40} {'median':>12} {'best':>12}")
+    for name, result in report["results"].items():
+        if "error" in result:
+            print(f"{name:<40} FAILED: {result['error']}")
+            continue
+        print(f"{name:<40} {result['median_ns'] / 1000:10.2f}us {result['min_ns'] / 1000:10.2f}us")
+    return 1 if any("error" in result for result in report["results"].values()) else 0
+
+
+def cmd_compare(args):
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; create one with: python -m benchmarks run --save {args.baseline}",
+              file=sys.stderr)
+        return 2
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    if args.current:
+        with open(args.current) as f:
+            current = json.load(f)
+    else:
+        current = run_all(args.filter)
+
+    if baseline.get("machine") != current.get("machine"):
+        print("WARNING: baseline was recorded on a different machine/interpreter; timings may not be comparable",
+              file=sys.stderr)
+
+    rows = compare(baseline, current, args.threshold)
+    print(f"{'benchmark':<40} {'baseline':>12} {'current':>12} {'change':>8}")
+    for name, base_ns, current_ns, change, regressed in rows:
+        if current_ns is None:
+            print(f"{name:<40} {'-' if base_ns is None else f'{base_ns / 1000:10.2f}us':>12} {'FAILED':>12}")
+            continue
+        if base_ns is None:
+            print(f"{name:<40} {'-':>12} {current_ns / 1000:10.2f}us {'new':>8}")
+            continue
+        flag = "  REGRESSION" if regressed else ""
+        print(f"{name:<40} {base_ns / 1000:10.2f}us {current_ns / 1000:10.2f}us {change:+7.1%}{flag}")
+
+    regressions = [row[0] for row in rows if row[4]]
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) beyond {args.threshold:.0%}: {', '.join(regressions)}")
+        return 1
+    print(f"\nNo regressions beyond {args.threshold:.0%}")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Backend hot-path micro-benchmarks.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="Run the benchmarks")
+    run_parser.add_argument("--filter", default="", help="Only run benchmarks whose name contains this")
+    run_parser.add_argument("--save", help="Write results as a JSON baseline to this path")
+    run_parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    run_parser.set_defaults(func=cmd_run)
+
+    compare_parser = subparsers.add_parser("compare", help="Compare against a JSON baseline")
+    compare_parser.add_argument("baseline", nargs="?", default=DEFAULT_BASELINE)
+    compare_parser.add_argument("--current", help="Compare these saved results instead of running the suite")
+    compare_parser.add_argument("--threshold", type=float, default=0.2, help="Allowed slowdown (0.2 = 20%%)")
+    compare_parser.add_argument("--filter", default="", help="Only run benchmarks whose name contains this")
+    compare_parser.set_defaults(func=cmd_compare)
+
+    args = parser.parse_args()
+    sys.exit(args.func(args))
+
+
+if __name__ == "__main__":
+    main()
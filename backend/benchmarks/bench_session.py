@@ -0,0 +1,152 @@
+"""SessionManager hot paths: Live event processing, audio forwarding, message encoding and log streaming."""
+
+import asyncio
+import json
+from benchmarks.fakes import (
+    FakeWebSocket, audio_event, conversation_history, input_transcript_event, output_transcript_event,
+    turn_complete_event
+)
+from benchmarks.harness import benchmark
+from result_shaping import flight_record, shape_for_model, ui_payload
+from subagents import check_flight_availability
+
+LOG_BATCH = 100  # Log entries per stream_logs call
+
+SUMMARY = "ANA NH102 departs LAX for NRT in May at 850 USD with 4 seats left. JAL JL006 is 1200 USD."
+
+
+def _manager():
+    from session_manager import SessionManager
+    manager = SessionManager(FakeWebSocket())
+    manager.session_id = "bench-session"
+    manager.user_id = "bench-user"
+    return manager
+
+
+def _drained(manager, handler, event, counts):
+    """Runs handler(event), then takes the queued audio the way send_audio_loop would (counting chunks)."""
+    async def run():
+        await handler(event)
+        while not manager.outbound_audio.empty():
+            manager.outbound_audio.get_nowait()
+            counts["audio_chunks"] += 1
+    return run
+
+
+def _audio_forwarding(handler_name, event):
+    manager = _manager()
+    counts = {"audio_chunks": 0}
+
+    def verify():
+        assert counts["audio_chunks"] == 1, f"expected 1 forwarded audio chunk, got {counts['audio_chunks']}"
+        assert manager.agent_speaking, "agent_speaking not set"
+    return _drained(manager, getattr(manager, handler_name), event, counts), verify
+
+
+def _sends_one_message(event):
+    manager = _manager()
+    counts = {"audio_chunks": 0}
+
+    def verify():
+        assert manager.websocket.messages == 1, f"expected 1 websocket message, got {manager.websocket.messages}"
+    return _drained(manager, manager.process_event, event, counts), manager, verify
+
+
+@benchmark("process_event.audio", number=2000)
+def process_event_audio():
+    return _audio_forwarding("process_event", audio_event())
+
+
+@benchmark("process_event.output_transcript", number=2000)
+def process_event_output_transcript():
+    run, _, verify = _sends_one_message(output_transcript_event())
+    return run, verify
+
+
+@benchmark("process_event.input_transcript", number=2000)
+def process_event_input_transcript():
+    run, manager, sent_one = _sends_one_message(input_transcript_event())
+
+    def verify():
+        sent_one()
+        assert manager.endpointing.turns == 1, "user speech wasn't tracked"
+    return run, verify
+
+
+@benchmark("process_event.turn_complete", number=200)
+def process_event_turn_complete():
+    """Turn completion on a long session, including memory budget enforcement and context compaction."""
+    from memory_budget import get_stored_session
+    from session_manager import APP_NAME
+    manager = _manager()
+    session = asyncio.get_event_loop().run_until_complete(
+        manager.session_service.create_session(app_name=APP_NAME, user_id=manager.user_id)
+    )
+    manager.session_id = session.id
+    stored = get_stored_session(manager.session_service, APP_NAME, manager.user_id, session.id)
+    history = conversation_history()
+    event = turn_complete_event()
+
+    async def run():
+        stored.events[:] = history  # Same oversized history every call, so every call compacts
+        await manager.process_event(event)
+
+    def verify():
+        assert manager.websocket.messages >= 1, "no vad_tuning report sent"
+        assert manager.context_tokens > 0, "memory budget enforcement didn't run"
+        assert manager.context_summary.compacted_events > 0, "history wasn't compacted"
+    return run, verify
+
+
+@benchmark("handle_content.audio", number=5000)
+def handle_content_audio():
+    return _audio_forwarding("handle_content", audio_event().content)
+
+
+@benchmark("json.transcript_partial", number=20000)
+def json_transcript_partial():
+    text = output_transcript_event().output_transcription.text
+    return lambda: json.dumps({"type": "transcript_partial", "text": text, "role": "agent"})
+
+
+@benchmark("json.subagent_complete", number=5000)
+def json_subagent_complete():
+    flights = [flight_record(check_flight_availability("Tokyo", date)) for date in ("May", "June")]
+    entry = {
+        "type": "subagent_complete",
+        "agent": "Flight Specialist",
+        "result": shape_for_model(SUMMARY, flights),
+        "duration": 1.234,
+        "timestamp": 1760000000.0,
+        "ui": ui_payload("Flight Specialist", SUMMARY, flights),
+    }
+    return lambda: json.dumps(entry)
+
+
+@benchmark("json.tool_response_compact", number=10000)
+def json_tool_response_compact():
+    flights = [flight_record(check_flight_availability("Tokyo", "May"))]
+    result = shape_for_model(SUMMARY, flights)
+    return lambda: json.dumps(result, separators=(",", ":"))
+
+
+@benchmark(f"stream_logs.{LOG_BATCH}_entries", number=100)
+def stream_logs_batch():
+    from logger import log_queue, log_tool_complete
+    manager = _manager()
+    flights = [flight_record(check_flight_availability("Tokyo", "May"))]
+    result = shape_for_model(SUMMARY, flights)
+    ui = ui_payload("Flight Specialist", SUMMARY, flights)
+    consumer = []
+
+    async def run():
+        if not consumer:
+            consumer.append(asyncio.create_task(manager.stream_logs()))
+        for _ in range(LOG_BATCH):
+            log_tool_complete("Flight Specialist", result, 1.234, ui=ui)
+        await log_queue.join()
+
+    def verify():
+        assert manager.websocket.messages == LOG_BATCH, \
+            f"expected {LOG_BATCH} forwarded log entries, got {manager.websocket.messages}"
+    return run, verify
@@ -0,0 +1,35 @@
+"""Specialist tool paths: the mock flight database and subagent orchestration overhead."""
+
+from types import SimpleNamespace
+from benchmarks.fakes import FakeSubagentRunner
+from benchmarks.harness import benchmark
+from subagents import check_flight_availability
+
+BENCH_APP = "bench"
+
+
+@benchmark("check_flight_availability", number=20000)
+def flight_lookup():
+    return lambda: check_flight_availability("Tokyo", "May 2025")
+
+
+@benchmark("run_subagent_sync.mocked_runner", number=200)
+def run_subagent_sync():
+    """
+    Everything _run_subagent_sync does around the model: session create/delete, scheduling onto the subagent
+    loop, the tool-call turn loop and in-flight bookkeeping. The pooled runner is replaced by a fake.
+    """
+    import tools
+    agent = SimpleNamespace(name="bench_flight_specialist", tools=[check_flight_availability])
+    with tools._pool_lock:
+        tools._runners[(agent.name, BENCH_APP)] = FakeSubagentRunner()
+    tool_results = []
+
+    def run():
+        tool_results.clear()
+        return tools._run_subagent_sync(agent, "Find flights to Tokyo in May", BENCH_APP, tool_results=tool_results)
+
+    def verify():
+        assert tool_results and tool_results[0][1].get("flight") == "ANA NH102", \
+            f"fake runner's tool call didn't run: {tool_results}"
+    return run, verify
@@ -0,0 +1,111 @@
+"""Synthetic inputs for the benchmarks: a websocket that discards output and Live / subagent events."""
+
+from google.adk.events import Event
+from google.adk.sessions import InMemorySessionService
+from google.genai import types
+
+AUDIO_CHUNK = b"\x00\x01" * 2400  # 100ms of 24kHz 16-bit mono, the size the Live API streams
+
+
+class FakeWebSocket:
+    """Accepts what SessionManager sends and only counts it."""
+
+    def __init__(self):
+        self.messages = 0
+        self.bytes_sent = 0
+
+    async def send_text(self, text: str):
+        self.messages += 1
+        self.bytes_sent += len(text)
+
+    async def send_bytes(self, data: bytes):
+        self.messages += 1
+        self.bytes_sent += len(data)
+
+    async def close(self):
+        pass
+
+
+def audio_event() -> Event:
+    return Event(
+        author="nomad_agent",
+        partial=True,
+        content=types.Content(
+            role="model", parts=[types.Part(inline_data=types.Blob(mime_type="audio/pcm;rate=24000", data=AUDIO_CHUNK))]
+        ),
+    )
+
+
+def output_transcript_event() -> Event:
+    return Event(
+        author="nomad_agent",
+        partial=True,
+        output_transcription=types.Transcription(text="I found a direct ANA flight to Tokyo for 850 dollars"),
+    )
+
+
+def input_transcript_event() -> Event:
+    return Event(
+        author="user",
+        partial=True,
+        input_transcription=types.Transcription(text="find me a flight to Tokyo in May"),
+    )
+
+
+def turn_complete_event() -> Event:
+    return Event(author="nomad_agent", turn_complete=True)
+
+
+class FakeSubagentRunner:
+    """
+    Stands in for a pooled InMemoryRunner: answers the first turn with a check_flight_availability call and the
+    tool-response turn with text, without calling a model. The session service is the real in-memory one.
+    """
+
+    def __init__(self):
+        self.session_service = InMemorySessionService()
+
+    async def run_async(self, user_id: str, session_id: str, new_message: types.Content):
+        if new_message.role == "user":
+            yield Event(
+                author="flight_specialist",
+                content=types.Content(role="model", parts=[types.Part(function_call=types.FunctionCall(
+                    id="call-1", name="check_flight_availability", args={"destination": "Tokyo", "date": "May"}
+                ))]),
+            )
+        else:
+            yield Event(
+                author="flight_specialist",
+                content=types.Content(role="model", parts=[types.Part(
+                    text="ANA NH102 departs LAX for NRT in May at 850 USD with 4 seats left."
+                )]),
+            )
+
+
+def conversation_history(turns: int = 120) -> list:
+    """A long voice conversation: user / model transcripts plus a flight tool call and result per turn."""
+    events = []
+    for turn in range(turns):
+        destination = ("Tokyo", "Osaka", "Seoul")[turn % 3]
+        events.append(Event(
+            author="user",
+            input_transcription=types.Transcription(text=f"What flights are there to {destination} in May? " * 4),
+        ))
+        events.append(Event(
+            author="nomad_agent",
+            content=types.Content(role="model", parts=[types.Part(function_call=types.FunctionCall(
+                id=f"call-{turn}", name="consult_flight_specialist", args={"destination": destination, "date": "May"}
+            ))]),
+        ))
+        events.append(Event(
+            author="nomad_agent",
+            content=types.Content(role="user", parts=[types.Part(function_response=types.FunctionResponse(
+                id=f"call-{turn}", name="consult_flight_specialist",
+                response={"summary": "ANA NH102 departs LAX for NRT at 850 USD. " * 20, "truncated": False}
+            ))]),
+        ))
+        events.append(Event(
+            author="nomad_agent",
+            output_transcription=types.Transcription(text=f"I found ANA NH102 to {destination} for $850. " * 4),
+        ))
+    return events
@@ -0,0 +1,146 @@
+"""
+Benchmark registry and timing.
+A benchmark is a zero-argument setup function returning the callable (or coroutine function) to time, or a
+(callable, verify) pair. The callable first runs once with its output visible, then verify() must pass (hot paths
+that swallow their own exceptions would otherwise be timed as a fast error path). Then comes a warm-up and
+`rounds` rounds of `number` calls; results are per call.
+"""
+
+import asyncio
+import contextlib
+import inspect
+import os
+import platform
+import statistics
+import sys
+import time
+from typing import Callable, Dict, NamedTuple
+
+
+class BenchmarkFailed(Exception):
+    """The benchmarked path didn't do what it should on its verification run."""
+
+
+class Benchmark(NamedTuple):
+    name: str
+    setup: Callable[[], Callable]
+    number: int
+    rounds: int
+
+
+BENCHMARKS: Dict[str, Benchmark] = {}
+
+
+def benchmark(name: str, number: int = 1000, rounds: int = 7):
+    """Registers a benchmark setup function under `name`."""
+    def register(setup):
+        BENCHMARKS[name] = Benchmark(name, setup, number, rounds)
+        return setup
+    return register
+
+
+@contextlib.contextmanager
+def _quiet():
+    """Discards the hot paths' debug output (the writes themselves are still timed)."""
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull), contextlib.redirect_stderr(devnull):
+        yield
+
+
+async def _time_async(func, number: int) -> float:
+    start = time.perf_counter_ns()
+    for _ in range(number):
+        await func()
+    return (time.perf_counter_ns() - start) / number
+
+
+def _time_sync(func, number: int) -> float:
+    start = time.perf_counter_ns()
+    for _ in range(number):
+        func()
+    return (time.perf_counter_ns() - start) / number
+
+
+def run_benchmark(bench: Benchmark) -> dict:
+    """Times one benchmark; returns per-call nanoseconds (median and best round)."""
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    try:
+        func = bench.setup()
+        verify = None
+        if isinstance(func, tuple):
+            func, verify = func
+
+        # Verification run, with output visible
+        if inspect.iscoroutinefunction(func):
+            loop.run_until_complete(func())
+        else:
+            func()
+        if verify is not None:
+            try:
+                verify()
+            except AssertionError as e:
+                raise BenchmarkFailed(f"{bench.name}: {e}") from e
+
+        with _quiet():
+            if inspect.iscoroutinefunction(func):
+                loop.run_until_complete(_time_async(func, max(1, bench.number // 10)))
+                samples = [loop.run_until_complete(_time_async(func, bench.number)) for _ in range(bench.rounds)]
+            else:
+                _time_sync(func, max(1, bench.number // 10))
+                samples = [_time_sync(func, bench.number) for _ in range(bench.rounds)]
+    finally:
+        # Stop background tasks a benchmark started (e.g. a stream_logs consumer)
+        pending = asyncio.all_tasks(loop)
+        for task in pending:
+            task.cancel()
+        loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+        loop.close()
+        asyncio.set_event_loop(None)
+
+    return {
+        "median_ns": statistics.median(samples),
+        "min_ns": min(samples),
+        "stdev_ns": statistics.stdev(samples) if len(samples) > 1 else 0.0,
+        "number": bench.number,
+        "rounds": bench.rounds,
+    }
+
+
+def run_all(name_filter: str = "") -> dict:
+    """Runs every registered benchmark whose name contains name_filter."""
+    results = {}
+    for name, bench in sorted(BENCHMARKS.items()):
+        if name_filter in name:
+            try:
+                results[name] = run_benchmark(bench)
+            except BenchmarkFailed as e:
+                results[name] = {"error": str(e)}
+                print(f"  {name:<40} FAILED: {e}", file=sys.stderr)
+                continue
+            print(f"  {name:<40} {results[name]['median_ns'] / 1000:10.2f}us", file=sys.stderr)
+    return {
+        "machine": {"python": platform.python_version(), "platform": platform.platform(),
+                    "processor": platform.processor()},
+        "created_at": time.time(),
+        "results": results,
+    }
+
+
+def compare(baseline: dict, current: dict, threshold: float) -> list:
+    """
+    Compares median per-call times. Returns rows of (name, baseline_ns, current_ns, change, regressed);
+    a benchmark regresses when it's more than `threshold` (a fraction) slower than its baseline, or when it
+    failed verification (current_ns is None).
+    """
+    rows = []
+    for name, result in sorted(current["results"].items()):
+        base = baseline["results"].get(name)
+        if "error" in result:
+            rows.append((name, base and base.get("median_ns"), None, None, True))
+            continue
+        if base is None or "error" in base:
+            rows.append((name, None, result["median_ns"], None, False))
+            continue
+        change = result["median_ns"] / base["median_ns"] - 1
+        rows.append((name, base["median_ns"], result["median_ns"], change, change > threshold))
+    return rows
@@ -0,0 +1,79 @@
+"""
+Precomputes the response snippet cache: synthesizes every RESPONSE_SNIPPETS entry with the Live model, once per
+voice, and stores the PCM clips in the memory-mapped cache (audio_cache.py).
+
+Usage:
+    python build_audio_cache.py [--voices Aoede Puck] [--snippets ack_flight greeting]
+    python build_audio_cache.py --list
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import config
+from audio_cache import open_audio_cache
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+VOICES = ("Aoede", "Puck", "Charon", "Kore", "Fenrir")  # The voices offered by the frontend
+
+SYNTHESIS_INSTRUCTION = "Read the user's message aloud exactly as written, in a warm, upbeat tone. Say nothing else."
+
+
+async def synthesize(client, voice: str, text: str) -> bytes:
+    """One Live API turn that speaks `text` in `voice`; returns the 24kHz PCM audio."""
+    from google.genai import types
+
+    live_config = types.LiveConnectConfig(
+        response_modalities=["AUDIO"],
+        system_instruction=SYNTHESIS_INSTRUCTION,
+        speech_config=types.SpeechConfig(
+            voice_config=types.VoiceConfig(prebuilt_voice_config=types.PrebuiltVoiceConfig(voice_name=voice))
+        ),
+    )
+    pcm = bytearray()
+    async with client.aio.live.connect(model=config.ORCHESTRATOR_MODEL, config=live_config) as session:
+        await session.send_client_content(
+            turns=types.Content(role="user", parts=[types.Part(text=text)]), turn_complete=True
+        )
+        async for message in session.receive():
+            if message.data:
+                pcm.extend(message.data)
+            if message.server_content and message.server_content.turn_complete:
+                break
+    return bytes(pcm)
+
+
+async def build(voices, snippets):
+    from dotenv import load_dotenv
+    from google import genai
+    load_dotenv(os.path.join(BACKEND_DIR, ".env"), override=True)
+
+    client = genai.Client()
+    cache = open_audio_cache()
+    for voice in voices:
+        for intent in snippets:
+            text = config.RESPONSE_SNIPPETS[intent]
+            pcm = await synthesize(client, voice, text)
+            stored = cache.put(intent, voice, pcm, text)
+            seconds = len(pcm) / 48000  # 24kHz * 2 bytes per sample
+            print(f"{voice:>8} {intent:<16} {seconds:5.2f}s {'stored' if stored else 'TOO LONG - skipped'}")
+    cache.flush()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Synthesize the precomputed response snippet cache.")
+    parser.add_argument("--voices", nargs="+", default=list(VOICES))
+    parser.add_argument("--snippets", nargs="+", default=list(config.RESPONSE_SNIPPETS),
+                        choices=list(config.RESPONSE_SNIPPETS))
+    parser.add_argument("--list", action="store_true", help="Print cache contents and exit")
+    args = parser.parse_args()
+
+    if args.list:
+        print(json.dumps(open_audio_cache().stats(), indent=2))
+        return
+    asyncio.run(build(args.voices, args.snippets))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""
+Process-wide GenAI client registry.
+Models share pooled keep-alive (HTTP/2 when available) connections instead of building a new client,
+TLS connection and credentials per runner or per subagent call.
+"""
+
+import importlib.util
+import threading
+from functools import cached_property
+import httpx
+from google import genai
+from google.genai import types
+from google.adk.models import Gemini
+import config
+
+
+class ConnectionMetrics:
+    """Counts requests versus newly opened connections for a client pool (via httpcore trace events)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.new_connections = 0
+        self.tls_handshakes = 0
+
+    def _record(self, event_name: str):
+        with self._lock:
+            if event_name == "connection.connect_tcp.complete":
+                self.new_connections += 1
+            elif event_name == "connection.start_tls.complete":
+                self.tls_handshakes += 1
+            elif event_name.endswith("send_request_headers.started"):
+                self.requests += 1
+
+    def trace(self, event_name, info):
+        self._record(event_name)
+
+    async def async_trace(self, event_name, info):
+        self._record(event_name)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            reused = max(0, self.requests - self.new_connections)
+            return {
+                "requests": self.requests,
+                "new_connections": self.new_connections,
+                "tls_handshakes": self.tls_handshakes,
+                "reused_requests": reused,
+                "reuse_ratio": reused / self.requests if self.requests else 0.0,
+            }
+
+
+_lock = threading.Lock()
+_clients = {}  # pool name -> genai.Client
+_metrics = {}  # pool name -> ConnectionMetrics
+
+
+def http2_enabled() -> bool:
+    return config.GENAI_HTTP2 and importlib.util.find_spec("h2") is not None
+
+
+def _httpx_client_args(metrics: ConnectionMetrics, is_async: bool) -> dict:
+    if is_async:
+        async def _attach_trace(request):
+            request.extensions["trace"] = metrics.async_trace
+    else:
+        def _attach_trace(request):
+            request.extensions["trace"] = metrics.trace
+
+    return {
+        "http2": http2_enabled(),
+        "limits": httpx.Limits(
+            max_connections=config.GENAI_POOL_MAX_CONNECTIONS,
+            max_keepalive_connections=config.GENAI_POOL_MAX_KEEPALIVE,
+            keepalive_expiry=config.GENAI_POOL_KEEPALIVE_EXPIRY_SECONDS,
+        ),
+        "event_hooks": {"request": [_attach_trace]},
+    }
+
+
+def _http_options(metrics: ConnectionMetrics, headers: dict = None) -> types.HttpOptions:
+    options = {"headers": headers} if headers else {}
+    if config.GENAI_BASE_URL:
+        options["base_url"] = config.GENAI_BASE_URL
+
+    # Newer google-genai accepts ready-made httpx clients (which also pins the async transport to httpx)
+    if "httpx_async_client" in types.HttpOptions.model_fields:
+        options["httpx_client"] = httpx.Client(**_httpx_client_args(metrics, is_async=False))
+        options["httpx_async_client"] = httpx.AsyncClient(**_httpx_client_args(metrics, is_async=True))
+    else:
+        options["client_args"] = _httpx_client_args(metrics, is_async=False)
+        options["async_client_args"] = _httpx_client_args(metrics, is_async=True)
+    return types.HttpOptions(**options)
+
+
+def get_client(pool: str = "default", headers: dict = None) -> genai.Client:
+    """
+    Returns the shared client for a pool, creating it on first use.
+    Async connections are bound to the event loop that first uses them, so use one pool per loop.
+    """
+    with _lock:
+        client = _clients.get(pool)
+        if client is None:
+            metrics = _metrics.setdefault(pool, ConnectionMetrics())
+            client = genai.Client(http_options=_http_options(metrics, headers))
+            _clients[pool] = client
+        return client
+
+
+def connection_metrics() -> dict:
+    """Per-pool connection reuse metrics (for /debug/connections)."""
+    with _lock:
+        pools = dict(_metrics)
+    return {
+        "http2": http2_enabled(),
+        "max_connections": config.GENAI_POOL_MAX_CONNECTIONS,
+        "max_keepalive": config.GENAI_POOL_MAX_KEEPALIVE,
+        "pools": {name: metrics.snapshot() for name, metrics in pools.items()},
+    }
+
+
+class PooledGemini(Gemini):
+    """Gemini model whose (non-Live) API client comes from the shared registry."""
+
+    pool: str = "default"
+
+    @cached_property
+    def api_client(self) -> genai.Client:
+        return get_client(self.pool, headers=getattr(self, "_tracking_headers", None))
+
+
+_models = {}
+
+
+def get_model(model_name: str, pool: str = "default") -> PooledGemini:
+    """Shared model instance for an agent (LlmAgent otherwise builds a new Gemini per lookup)."""
+    with _lock:
+        key = (model_name, pool)
+        if key not in _models:
+            _models[key] = PooledGemini(model=model_name, pool=pool)
+        return _models[key]
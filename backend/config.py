@@ -3,6 +3,11 @@ import os
 # Model Configurations
 ORCHESTRATOR_MODEL = "gemini-live-2.5-flash-native-audio"
 SUBAGENT_MODEL = "gemini-2.5-flash"
+TEXT_MODEL = "gemini-2.5-flash"  # Orchestrator model for the text-only SSE endpoint
+
+# Streaming tool mode: the orchestrator uses streaming specialist tools (ADK Live streaming tools)
+# that surface partial results to the model while the subagent is still running
+STREAMING_SPECIALISTS = False
 
 # App Configuration
 APP_NAME = "nomad_travel_planner"
@@ -18,6 +23,7 @@ When users ask questions:
 - For flights, prices, or airlines: use consult_flight_specialist tool
 - For destinations, weather, events, or activities: use consult_lifestyle_specialist tool
 - You can consult multiple specialists for complex queries
+- For comparisons across several destinations, dates or topics: use compare_travel_options ONCE with all of them instead of many separate calls
 
 Always:
 - Acknowledge which specialist you're consulting
@@ -37,6 +43,15 @@ IMPORTANT:
 - Just call the tool silently.
 - When the specialist returns information, IMMEDIATELY answer the user's question with that information.
 - Do NOT wait for the user to ask again.
+
+{user_profile?}
+"""
+
+STREAMING_INSTRUCTION_ADDENDUM = """
+STREAMING MODE:
+- Use stream_flight_specialist instead of consult_flight_specialist, and stream_lifestyle_specialist instead of consult_lifestyle_specialist.
+- These tools report results progressively. Results marked "partial": true are early findings (for example the first flight found) - you may start telling the user about them right away.
+- The result marked "partial": false is the specialist's final answer; use it to refine or confirm what you said.
 """
 
 FLIGHT_SPECIALIST_INSTRUCTION = """You are a flight specialist agent.
@@ -50,3 +65,116 @@ You handle queries about destinations, events, weather, and local activities.
 Use the google_search tool to find current information.
 Keep responses concise and informative.
 Focus on practical travel information."""
+
+# Memory Budgets (per session)
+SESSION_MAX_EVENTS = 200  # Events kept in the orchestrator session history before compaction
+SESSION_MEMORY_BUDGET_BYTES = 4 * 1024 * 1024  # Approximate byte budget for a session's event history
+TOOL_TIMER_TTL_SECONDS = 120  # Tool timers older than this are treated as orphaned and dropped
+
+# Context Window Compaction
+CONTEXT_TOKEN_BUDGET = 24000  # Approximate session tokens before older turns are folded into a summary
+CONTEXT_KEEP_RECENT_EVENTS = 30  # Most recent events kept verbatim when compacting
+CONTEXT_TOOL_RESULT_MAX_CHARS = 600  # Specialist results in retained history are trimmed to this length
+CONTEXT_SUMMARY_MAX_LINES = 20  # Rolling transcript lines kept in the summary
+CONTEXT_LATENCY_SAMPLES = 500  # Turn latency samples kept per session for /debug/context
+# Live API server-side compression (sliding window) and session resumption
+LIVE_COMPRESSION_TRIGGER_TOKENS = 25600
+LIVE_COMPRESSION_TARGET_TOKENS = 12800
+LIVE_SESSION_RESUMPTION = True  # Keep resumption handles and reconnect dropped Live connections
+LIVE_MAX_RECONNECTS = 3  # Reconnect attempts per client connection
+
+# Specialist Result Shaping
+SPECIALIST_RESULT_MAX_BYTES = 1200  # Hard budget for results returned to the orchestrator (~300 tokens)
+SPECIALIST_RESULT_MAX_FLIGHTS = 3  # Cheapest flights kept in the model-facing payload
+
+# Fan-out (batch) specialist queries
+FANOUT_MAX_CONCURRENCY = 4  # Subagent runs in flight at once per batch call
+FANOUT_MAX_QUERIES = 12  # Unique sub-queries run per batch call (extra ones are dropped)
+FANOUT_MAX_RANKED_FLIGHTS = 6  # Ranked flight options returned to the orchestrator
+FANOUT_RESULT_MAX_BYTES = 2400  # Byte budget for the merged comparison returned to the orchestrator
+
+# Local Intent Router (pre-dispatches obvious specialist calls from final user transcripts)
+INTENT_ROUTER_ENABLED = True
+INTENT_PREDISPATCH_MIN_CONFIDENCE = 0.75
+INTENT_HASH_BUCKETS = 4096
+INTENT_KEYWORD_BOOST = 0.5  # Added to an intent's score when its keyword rule matches
+INTENT_SOFTMAX_TEMPERATURE = 0.1
+PREFETCH_TTL_SECONDS = 30  # Unclaimed pre-dispatched results are discarded after this long
+
+# Shared GenAI clients / HTTP connection pooling
+GENAI_POOL_MAX_CONNECTIONS = 64  # Max open connections per client pool
+GENAI_POOL_MAX_KEEPALIVE = 32  # Idle keep-alive connections kept per pool
+GENAI_POOL_KEEPALIVE_EXPIRY_SECONDS = 120
+GENAI_HTTP2 = True  # Used when the h2 package is installed
+GENAI_BASE_URL = os.environ.get("GENAI_BASE_URL")  # Override the API endpoint (e.g. a local stub server)
+
+# Client-side rate limiting (token buckets: (tokens per second, burst capacity))
+ORCHESTRATOR_MODEL_RATE_LIMIT = (2.0, 10)  # New Live sessions
+SUBAGENT_MODEL_RATE_LIMIT = (8.0, 16)  # Subagent model calls
+TOOL_RATE_LIMITS = {
+    "flight_specialist": (4.0, 8),
+    "lifestyle_specialist": (4.0, 8),
+}
+RATE_LIMIT_MAX_WAIT_SECONDS = 6.0  # Queued calls fail fast after this long
+SESSION_START_MAX_WAIT_SECONDS = 15.0
+RATE_LIMIT_BACKOFF_BASE_SECONDS = 1.0  # Pause after a 429, doubled per consecutive 429
+RATE_LIMIT_BACKOFF_MAX_SECONDS = 30.0
+RATE_LIMIT_MIN_RATE_SCALE = 0.1  # Adaptive rate never drops below this fraction of the configured rate
+RATE_LIMIT_RECOVERY_STEP = 0.05  # Rate scale regained per successful call
+# Returned to the orchestrator (and spoken) instead of raw quota errors
+SPECIALIST_BUSY_MESSAGE = "The {specialist} is handling a lot of requests right now. Please ask again in a moment."
+
+# Barge-in handling
+BARGE_IN_CANCEL_SUBAGENTS = True  # Cancel in-flight subagent runs on the server's interrupted signal (pre-dispatched runs are kept)
+BARGE_IN_MIN_TRANSCRIPT_CHARS = 4  # Shorter user transcripts (e.g. "uh") don't count as barge-in
+BARGE_IN_GRACE_SECONDS = 0.5  # Transcription this soon after a response starts still belongs to the user's turn
+
+# Text-only SSE endpoint
+TEXT_SESSION_TTL_SECONDS = 900  # Idle text conversations are deleted after this long
+SSE_HEARTBEAT_SECONDS = 15  # Comment lines sent while idle so proxies keep the stream open
+TEXT_REQUEST_MAX_WAIT_SECONDS = 10.0  # Max queue wait for a text-model slot
+
+# Persistent user memory (SQLite)
+USER_MEMORY_ENABLED = True
+USER_MEMORY_DB_PATH = os.environ.get("USER_MEMORY_DB_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "nomad_memory.db"))
+USER_MEMORY_MAX_CHARS = 600  # Budget for the profile injected into the instruction at session start
+USER_MEMORY_MAX_TRIPS = 5  # Most recent trips considered for injection
+USER_MEMORY_LOAD_TIMEOUT_SECONDS = 0.15  # Don't hold up the connection longer than this for the profile
+
+# Adaptive turn-taking (automatic activity detection tuned per speaker)
+ADAPTIVE_VAD_ENABLED = True
+VAD_SILENCE_MIN_MS = 300  # Never endpoint faster than this
+VAD_SILENCE_MAX_MS = 1500  # Never wait longer than this
+VAD_MIN_PAUSE_MS = 250  # Transcription gaps shorter than this are chunking, not pauses
+VAD_PAUSE_MARGIN_MS = 150  # Headroom above the speaker's 90th-percentile pause
+VAD_FALSE_ENDPOINT_WINDOW_SECONDS = 1.5  # User speech this soon after the model starts answering = cut off
+VAD_FALSE_ENDPOINT_TARGET = 0.1  # Above this false-endpoint rate the silence duration backs off
+VAD_MAX_ADJUST_MS = 200  # Largest change applied between sessions
+VAD_MIN_TURNS = 3  # Turns observed before recommending a change
+VAD_HIGH_SENSITIVITY_MAX_MS = 600  # Use END_SENSITIVITY_HIGH at or below this silence duration
+
+# Precomputed response snippets (memory-mapped audio cache)
+AUDIO_CACHE_ENABLED = True
+AUDIO_CACHE_PATH = os.environ.get("AUDIO_CACHE_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "audio_cache.bin"))
+AUDIO_CACHE_MAX_BYTES = 16 * 1024 * 1024  # Total size of the mapped file
+AUDIO_CACHE_SLOT_BYTES = 240_000  # One clip per slot: 5s of 24kHz 16-bit mono
+AUDIO_CACHE_EVICTION = "lru"  # "lru" or "lfu" when every slot is taken
+AUDIO_CACHE_CHUNK_BYTES = 4800  # Cached clips are queued in 100ms chunks (so barge-in can purge them)
+
+# Snippet intent -> text spoken for it (synthesized per voice by build_audio_cache.py)
+RESPONSE_SNIPPETS = {
+    "ack_flight": "Sure, checking flights for you now.",
+    "ack_lifestyle": "Good question, let me look into that.",
+    "ack_compare": "Let me compare those options for you.",
+    "greeting": "Hi, I'm Nomad! Where would you like to go?",
+}
+AUDIO_CACHE_GREETING = True  # Play the cached greeting as soon as a voice session starts
+
+# Tool -> acknowledgement snippet played while the specialist works
+TOOL_ACK_SNIPPETS = {
+    "consult_flight_specialist": "ack_flight",
+    "stream_flight_specialist": "ack_flight",
+    "consult_lifestyle_specialist": "ack_lifestyle",
+    "stream_lifestyle_specialist": "ack_lifestyle",
+    "compare_travel_options": "ack_compare",
+}
@@ -0,0 +1,227 @@
+"""
+Context window compaction for long Live conversations.
+Tracks approximate token usage of a session and folds older turns into a rolling summary of key facts.
+"""
+
+import json
+import re
+from google.genai import types
+from google.adk.events import Event
+import config
+
+# Approximate token costs: ~4 characters per text token, ~32 audio tokens per second of 16kHz 16-bit PCM
+CHARS_PER_TOKEN = 4
+AUDIO_BYTES_PER_TOKEN = 1000
+
+SUMMARY_AUTHOR = "context_summary"
+
+FLIGHT_CODE_PATTERN = re.compile(r"\b([A-Z]{2}\s?\d{2,4})\b")
+PRICE_PATTERN = re.compile(r"\$\s?\d[\d,]*|\b\d[\d,]*\s?USD\b")
+
+
+def estimate_event_tokens(event) -> int:
+    """Approximate number of context tokens an event contributes."""
+    chars = 0
+    audio_bytes = 0
+
+    content = getattr(event, "content", None)
+    for part in (getattr(content, "parts", None) or []):
+        if getattr(part, "text", None):
+            chars += len(part.text)
+        inline_data = getattr(part, "inline_data", None)
+        if inline_data is not None and getattr(inline_data, "data", None):
+            audio_bytes += len(inline_data.data)
+        function_call = getattr(part, "function_call", None)
+        if function_call is not None and function_call.args:
+            chars += len(json.dumps(function_call.args, default=str))
+        function_response = getattr(part, "function_response", None)
+        if function_response is not None and function_response.response:
+            chars += len(json.dumps(function_response.response, default=str))
+
+    for attr in ("input_transcription", "output_transcription"):
+        transcription = getattr(event, attr, None)
+        if transcription is not None and getattr(transcription, "text", None):
+            chars += len(transcription.text)
+
+    return chars // CHARS_PER_TOKEN + audio_bytes // AUDIO_BYTES_PER_TOKEN
+
+
+def estimate_session_tokens(session) -> int:
+    """Approximate number of context tokens held in a session's history."""
+    if session is None:
+        return 0
+    return sum(estimate_event_tokens(event) for event in (getattr(session, "events", None) or []))
+
+
+def _trim(text: str, limit: int) -> str:
+    return text if len(text) <= limit else text[:limit].rstrip() + "..."
+
+
+class ConversationSummary:
+    """Rolling summary of compacted turns: key facts plus the last few transcript lines."""
+
+    def __init__(self):
+        self.destinations = []
+        self.dates = []
+        self.flights = []
+        self.prices = []
+        self.topics = []
+        self.lines = []
+        self.compacted_events = 0
+
+    @staticmethod
+    def _remember(values: list, value):
+        if value and value not in values:
+            values.append(value)
+
+    def add_event(self, event):
+        """Folds a single event into the summary."""
+        self.compacted_events += 1
+
+        content = getattr(event, "content", None)
+        role = getattr(content, "role", None) or "model"
+        for part in (getattr(content, "parts", None) or []):
+            function_call = getattr(part, "function_call", None)
+            if function_call is not None:
+                args = dict(function_call.args or {})
+                self._remember(self.destinations, args.get("destination"))
+                self._remember(self.dates, args.get("date"))
+                self._remember(self.topics, args.get("query"))
+
+            function_response = getattr(part, "function_response", None)
+            if function_response is not None and function_response.response:
+                result_text = json.dumps(function_response.response, default=str)
+                for code in FLIGHT_CODE_PATTERN.findall(result_text):
+                    self._remember(self.flights, code)
+                for price in PRICE_PATTERN.findall(result_text):
+                    self._remember(self.prices, price.strip())
+
+            if getattr(part, "text", None) and not getattr(part, "thought", False):
+                self.lines.append(f"{role}: {part.text.strip()}")
+
+        for attr, speaker in (("input_transcription", "user"), ("output_transcription", "model")):
+            transcription = getattr(event, attr, None)
+            if transcription is not None and getattr(transcription, "text", None):
+                self.lines.append(f"{speaker}: {transcription.text.strip()}")
+
+        del self.lines[:-config.CONTEXT_SUMMARY_MAX_LINES]
+
+    def render(self) -> str:
+        """Renders the summary as text for the model."""
+        facts = []
+        if self.destinations:
+            facts.append(f"Destinations discussed: {', '.join(map(str, self.destinations))}")
+        if self.dates:
+            facts.append(f"Travel dates: {', '.join(map(str, self.dates))}")
+        if self.flights:
+            facts.append(f"Flights mentioned: {', '.join(self.flights)}")
+        if self.prices:
+            facts.append(f"Prices quoted: {', '.join(self.prices)}")
+        if self.topics:
+            facts.append(f"Other topics: {', '.join(map(str, self.topics))}")
+
+        text = f"[Summary of the earlier conversation ({self.compacted_events} events compacted)]\n"
+        if facts:
+            text += "Key facts:\n" + "\n".join(f"- {fact}" for fact in facts) + "\n"
+        if self.lines:
+            text += "Recent exchanges before this point:\n" + "\n".join(self.lines)
+        return text
+
+    def to_dict(self) -> dict:
+        return {
+            "destinations": self.destinations,
+            "dates": self.dates,
+            "flights": self.flights,
+            "prices": self.prices,
+            "topics": self.topics,
+            "compacted_events": self.compacted_events,
+        }
+
+
+def _is_summary_event(event) -> bool:
+    return getattr(event, "author", None) == SUMMARY_AUTHOR
+
+
+def _trim_tool_results(event, limit: int):
+    """Shortens verbose specialist results kept in the retained history."""
+    content = getattr(event, "content", None)
+    for part in (getattr(content, "parts", None) or []):
+        function_response = getattr(part, "function_response", None)
+        if function_response is None or not isinstance(function_response.response, dict):
+            continue
+        for key, value in function_response.response.items():
+            if isinstance(value, str) and len(value) > limit:
+                function_response.response[key] = _trim(value, limit)
+
+
+def has_summary(events: list) -> bool:
+    """Whether the history starts with the rolling summary event."""
+    return bool(events) and _is_summary_event(events[0])
+
+
+def upsert_summary_event(events: list, summary: ConversationSummary):
+    """Writes the current summary as the leading event of the history (replacing the previous one)."""
+    summary_event = Event(
+        author=SUMMARY_AUTHOR,
+        content=types.Content(role="user", parts=[types.Part(text=summary.render())])
+    )
+    if has_summary(events):
+        events[0] = summary_event
+    else:
+        events.insert(0, summary_event)
+
+
+def compact_context(events: list, summary: ConversationSummary,
+                    keep_recent: int = config.CONTEXT_KEEP_RECENT_EVENTS) -> int:
+    """
+    Folds all but the most recent events into the rolling summary, in place.
+    The summary is stored as a single leading event. Returns the number of events folded.
+    """
+    existing_summary = 1 if has_summary(events) else 0
+    fold_until = len(events) - keep_recent
+    if fold_until <= existing_summary:
+        return 0
+
+    for event in events[existing_summary:fold_until]:
+        summary.add_event(event)
+
+    for event in events[fold_until:]:
+        _trim_tool_results(event, config.CONTEXT_TOOL_RESULT_MAX_CHARS)
+
+    del events[existing_summary:fold_until]
+    upsert_summary_event(events, summary)
+    return fold_until - existing_summary
+
+
+def live_compression_settings() -> dict:
+    """RunConfig kwargs for Live API context window compression and session resumption."""
+    settings = {
+        "context_window_compression": types.ContextWindowCompressionConfig(
+            trigger_tokens=config.LIVE_COMPRESSION_TRIGGER_TOKENS,
+            sliding_window=types.SlidingWindow(target_tokens=config.LIVE_COMPRESSION_TARGET_TOKENS)
+        )
+    }
+    if config.LIVE_SESSION_RESUMPTION:
+        settings["session_resumption"] = types.SessionResumptionConfig()
+    return settings
+
+
+def latency_by_session_length(samples: list, bucket_tokens: int = 4000) -> list:
+    """
+    Buckets (context_tokens, ttfb_seconds) samples by session length.
+    Returns average turn latency per bucket, ordered by session length.
+    """
+    buckets = {}
+    for tokens, latency in samples:
+        bucket = (tokens // bucket_tokens) * bucket_tokens
+        buckets.setdefault(bucket, []).append(latency)
+
+    return [
+        {
+            "context_tokens_from": bucket,
+            "context_tokens_to": bucket + bucket_tokens,
+            "turns": len(latencies),
+            "avg_ttfb": sum(latencies) / len(latencies),
+        }
+        for bucket, latencies in sorted(buckets.items())
+    ]
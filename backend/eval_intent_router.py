@@ -0,0 +1,100 @@
+"""
+Offline evaluation of the local intent router.
+Reports per-intent precision/recall, slot accuracy, pre-dispatch rate and per-utterance latency.
+
+Usage:
+    python eval_intent_router.py [--data intent_eval.jsonl] [--verbose]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import time
+from intent_router import INTENTS, route, should_predispatch
+
+DEFAULT_DATA = os.path.join(os.path.dirname(os.path.abspath(__file__)), "intent_eval.jsonl")
+
+
+def load_examples(path: str) -> list:
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def evaluate(examples: list, verbose: bool = False) -> dict:
+    counts = {intent: {"tp": 0, "fp": 0, "fn": 0} for intent in INTENTS}
+    latencies = []
+    slot_hits = slot_total = 0
+    predispatched = wrong_predispatch = 0
+
+    for example in examples:
+        start = time.perf_counter()
+        decision = route(example["text"])
+        latencies.append((time.perf_counter() - start) * 1000)
+
+        expected, predicted = example["intent"], decision["intent"]
+        if predicted == expected:
+            counts[expected]["tp"] += 1
+        else:
+            counts[predicted]["fp"] += 1
+            counts[expected]["fn"] += 1
+
+        for slot in ("destination", "date"):
+            if slot in example:
+                slot_total += 1
+                slot_hits += decision[slot] == example[slot]
+
+        if should_predispatch(decision):
+            predispatched += 1
+            wrong_predispatch += predicted != expected
+
+        if verbose and (predicted != expected or decision["destination"] != example.get("destination")):
+            print(f"  MISS {example['text']!r}: expected {expected}/{example.get('destination')}, "
+                  f"got {predicted}/{decision['destination']} ({decision['confidence']:.2f})")
+
+    per_intent = {}
+    for intent, c in counts.items():
+        precision = c["tp"] / (c["tp"] + c["fp"]) if c["tp"] + c["fp"] else 0.0
+        recall = c["tp"] / (c["tp"] + c["fn"]) if c["tp"] + c["fn"] else 0.0
+        per_intent[intent] = {"precision": precision, "recall": recall, "support": c["tp"] + c["fn"]}
+
+    latencies.sort()
+    return {
+        "examples": len(examples),
+        "accuracy": sum(c["tp"] for c in counts.values()) / len(examples) if examples else 0.0,
+        "per_intent": per_intent,
+        "slot_accuracy": slot_hits / slot_total if slot_total else 0.0,
+        "predispatch_rate": predispatched / len(examples) if examples else 0.0,
+        "predispatch_errors": wrong_predispatch,
+        "latency_ms": {
+            "mean": statistics.mean(latencies) if latencies else 0.0,
+            "p50": latencies[len(latencies) // 2] if latencies else 0.0,
+            "p95": latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))] if latencies else 0.0,
+            "max": latencies[-1] if latencies else 0.0,
+        },
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Evaluate the local intent router offline.")
+    parser.add_argument("--data", default=DEFAULT_DATA, help="JSONL with text, intent and optional destination/date")
+    parser.add_argument("--verbose", action="store_true", help="Print misclassified examples")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args()
+
+    report = evaluate(load_examples(args.data), verbose=args.verbose)
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    print(f"Examples: {report['examples']}  Accuracy: {report['accuracy']:.3f}  Slot accuracy: {report['slot_accuracy']:.3f}")
+    for intent, stats in report["per_intent"].items():
+        print(f"  {intent:<10} precision {stats['precision']:.3f}  recall {stats['recall']:.3f}  (n={stats['support']})")
+    print(f"Pre-dispatch rate: {report['predispatch_rate']:.3f}  (wrong intent: {report['predispatch_errors']})")
+    latency = report["latency_ms"]
+    print(f"Latency per utterance: mean {latency['mean']:.3f}ms  p50 {latency['p50']:.3f}ms  "
+          f"p95 {latency['p95']:.3f}ms  max {latency['max']:.3f}ms")
+
+
+if __name__ == "__main__":
+    main()
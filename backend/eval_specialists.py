@@ -0,0 +1,190 @@
+"""
+Offline batch evaluation of the specialists.
+Runs a JSONL of queries through the flight / lifestyle specialist subagents (or the mock
+specialists) across a process pool, records per-query latency, prints summary stats and diffs against a
+previous run so prompt changes in config.py can be checked for latency regressions before deploy.
+
+Query lines:
+    {"id": "...", "specialist": "flight", "destination": "Tokyo", "date": "May"}
+    {"id": "...", "specialist": "lifestyle", "query": "What's the weather like in Tokyo in May?"}
+
+Usage:
+    python eval_specialists.py [--queries specialist_eval.jsonl] [--concurrency 4] [--mock]
+                               [--output eval_runs/run.jsonl] [--baseline eval_runs/previous.jsonl]
+                               [--threshold 0.2]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_QUERIES = os.path.join(BACKEND_DIR, "specialist_eval.jsonl")
+DEFAULT_OUTPUT_DIR = os.path.join(BACKEND_DIR, "eval_runs")
+
+MOCK_FLIGHT_SUMMARY = "Here are the flights I found."
+MOCK_LIFESTYLE_ANSWER = "Mild spring weather, cherry blossom season, and plenty of street food markets."
+
+
+def _consult(query: dict, mock: bool):
+    """
+    Runs one query. Real queries call the subagents directly rather than through consult_*_specialist, whose
+    wrappers turn failures (quota, expired keys) into answer text; here they raise and are recorded as errors.
+    """
+    from result_shaping import collect_flights, shape_for_model
+    if query["specialist"] == "flight":
+        tool_results = []
+        if mock:
+            # Mock flight database only, shaped like the real tool's result
+            from subagents import check_flight_availability
+            tool_results.append(("check_flight_availability",
+                                 check_flight_availability(query["destination"], query["date"])))
+            summary = MOCK_FLIGHT_SUMMARY
+        else:
+            from subagents import get_flight_specialist
+            from tools import _run_subagent_sync
+            summary = _run_subagent_sync(
+                get_flight_specialist(), f"Find flights to {query['destination']} for {query['date']}",
+                "agents", tool_results
+            )
+        return shape_for_model(summary, collect_flights(tool_results))
+
+    if mock:
+        return shape_for_model(MOCK_LIFESTYLE_ANSWER)
+    from subagents import get_lifestyle_specialist
+    from tools import _run_subagent_sync
+    return shape_for_model(_run_subagent_sync(get_lifestyle_specialist(), query["query"], "agents"))
+
+
+def run_query(query: dict, mock: bool) -> dict:
+    """Runs one query (in a worker process) and returns its result record."""
+    start = time.perf_counter()
+    output, error = None, None
+    try:
+        output = _consult(query, mock)
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+    return {
+        "id": query["id"],
+        "specialist": query["specialist"],
+        "input": {k: v for k, v in query.items() if k not in ("id", "specialist")},
+        "output": output,
+        "error": error,
+        "latency": time.perf_counter() - start,
+    }
+
+
+def _init_worker():
+    from dotenv import load_dotenv
+    load_dotenv(os.path.join(BACKEND_DIR, ".env"), override=True)
+
+
+def run_all(queries: list, concurrency: int, mock: bool) -> list:
+    # Mock runs make no model calls, so they don't need credentials from .env
+    with ProcessPoolExecutor(max_workers=concurrency, initializer=None if mock else _init_worker) as pool:
+        return list(pool.map(run_query, queries, [mock] * len(queries)))
+
+
+def _percentile(values: list, fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))] if ordered else 0.0
+
+
+def summarize(results: list) -> dict:
+    summary = {}
+    for specialist in sorted({r["specialist"] for r in results}) + ["all"]:
+        group = [r for r in results if specialist == "all" or r["specialist"] == specialist]
+        latencies = [r["latency"] for r in group if not r["error"]]
+        summary[specialist] = {
+            "queries": len(group),
+            "errors": sum(1 for r in group if r["error"]),
+            "mean": statistics.mean(latencies) if latencies else 0.0,
+            "p50": _percentile(latencies, 0.5),
+            "p95": _percentile(latencies, 0.95),
+            "max": max(latencies) if latencies else 0.0,
+        }
+    return summary
+
+
+def diff(results: list, baseline: list, threshold: float, min_delta: float) -> dict:
+    """Compares against a previous run by query id. Regressions are slower by > threshold and > min_delta seconds."""
+    previous = {r["id"]: r for r in baseline}
+    rows, regressions = [], []
+    for result in results:
+        before = previous.get(result["id"])
+        if before is None:
+            continue
+        delta = result["latency"] - before["latency"]
+        row = {
+            "id": result["id"],
+            "before": before["latency"],
+            "after": result["latency"],
+            "delta": delta,
+            "change": delta / before["latency"] if before["latency"] else 0.0,
+            "output_changed": result["output"] != before["output"],
+            "newly_failing": bool(result["error"]) and not before["error"],
+        }
+        rows.append(row)
+        if row["newly_failing"] or (row["change"] > threshold and delta > min_delta):
+            regressions.append(row)
+
+    return {
+        "compared": len(rows),
+        "missing_from_baseline": len(results) - len(rows),
+        "rows": rows,
+        "regressions": regressions,
+    }
+
+
+def _load_jsonl(path: str) -> list:
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Batch-evaluate specialist quality and latency.")
+    parser.add_argument("--queries", default=DEFAULT_QUERIES)
+    parser.add_argument("--concurrency", type=int, default=4, help="Worker processes")
+    parser.add_argument("--mock", action="store_true", help="Use the mock specialists (no model calls)")
+    parser.add_argument("--output", help="Results JSONL (default: eval_runs/<timestamp>.jsonl)")
+    parser.add_argument("--baseline", help="Previous results JSONL to diff against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Relative slowdown counted as a regression")
+    parser.add_argument("--min-delta", type=float, default=0.05, help="Ignore slowdowns smaller than this (seconds)")
+    args = parser.parse_args()
+
+    queries = _load_jsonl(args.queries)
+    started = time.perf_counter()
+    results = run_all(queries, args.concurrency, args.mock)
+    wall_time = time.perf_counter() - started
+
+    output = args.output or os.path.join(DEFAULT_OUTPUT_DIR, time.strftime("%Y%m%d-%H%M%S") + ".jsonl")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        for result in results:
+            f.write(json.dumps(result, default=str) + "\n")
+
+    print(f"Ran {len(results)} queries in {wall_time:.2f}s with {args.concurrency} workers -> {output}")
+    for specialist, stats in summarize(results).items():
+        print(f"  {specialist:<10} n={stats['queries']:<4} errors={stats['errors']:<3} "
+              f"mean {stats['mean']:.3f}s  p50 {stats['p50']:.3f}s  p95 {stats['p95']:.3f}s  max {stats['max']:.3f}s")
+
+    if not args.baseline:
+        return
+
+    report = diff(results, _load_jsonl(args.baseline), args.threshold, args.min_delta)
+    changed = sum(1 for row in report["rows"] if row["output_changed"])
+    print(f"Compared {report['compared']} queries with {args.baseline} "
+          f"({report['missing_from_baseline']} new, {changed} with changed output)")
+    for row in report["regressions"]:
+        reason = "now failing" if row["newly_failing"] else f"{row['before']:.3f}s -> {row['after']:.3f}s ({row['change']:+.0%})"
+        print(f"  REGRESSION {row['id']}: {reason}")
+    if report["regressions"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
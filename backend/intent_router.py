@@ -0,0 +1,250 @@
+"""
+Local intent router for final user transcripts.
+Keyword/regex rules plus a hashed n-gram centroid model (CPU-only, no model round trip) classify an utterance,
+so the obvious specialist calls can be dispatched before the Live model asks for them.
+"""
+
+import math
+import re
+import time
+import zlib
+from typing import Dict, List, Optional, Tuple, TypedDict
+import config
+
+FLIGHT = "flight"
+LIFESTYLE = "lifestyle"
+OTHER = "other"
+INTENTS = (FLIGHT, LIFESTYLE, OTHER)
+
+# Seed utterances for the n-gram centroids
+TRAINING_UTTERANCES = {
+    FLIGHT: [
+        "find me flights to tokyo in may",
+        "how much is a flight to paris",
+        "are there any flights to london next week",
+        "i want to fly to new york in june",
+        "which airlines fly to seoul",
+        "book a ticket to osaka",
+        "what's the cheapest airfare to rome",
+        "show me nonstop flights to sydney",
+        "when does the flight to singapore depart",
+        "flights from los angeles to tokyo under a thousand dollars",
+        "is there a plane to bangkok in july",
+        "compare ticket prices to berlin",
+        "can i get a seat on a flight to madrid",
+        "what time do flights leave for honolulu",
+        "how long is the flight to dubai",
+    ],
+    LIFESTYLE: [
+        "what's the weather like in tokyo",
+        "what is there to do in paris",
+        "are there any festivals in kyoto in may",
+        "what events are happening in london next week",
+        "will it rain in seoul in june",
+        "what are the best restaurants in rome",
+        "what should i see in barcelona",
+        "is it hot in bangkok in july",
+        "recommend some museums in berlin",
+        "what's the nightlife like in berlin",
+        "what activities are good for kids in orlando",
+        "what's the temperature in sydney in december",
+        "tell me about things to do in osaka",
+        "what food should i try in singapore",
+        "what are the top attractions in new york",
+    ],
+    OTHER: [
+        "hello",
+        "hi there how are you",
+        "who are you",
+        "thank you",
+        "thanks that's great",
+        "yes please",
+        "no that's all",
+        "can you repeat that",
+        "what can you do",
+        "okay sounds good",
+        "never mind",
+        "goodbye",
+    ],
+}
+
+KEYWORD_RULES = {
+    FLIGHT: re.compile(
+        r"\b(flights?|fly|flying|airlines?|airfares?|fares?|tickets?|planes?|depart\w*|nonstop|layovers?|seats?)\b"
+    ),
+    LIFESTYLE: re.compile(
+        r"\b(weather|temperature|rain\w*|sunny|hot|cold|events?|festivals?|things to do|activit\w+|restaurants?|food|"
+        r"museums?|sightseeing|attractions?|nightlife|see in|visit in)\b"
+    ),
+}
+
+# Lifestyle categories used to match a user's question against the model's later tool query
+LIFESTYLE_CATEGORIES = {
+    "weather": re.compile(r"\b(weather|temperature|rain\w*|sunny|hot|cold|climate)\b"),
+    "events": re.compile(r"\b(events?|festivals?|concerts?|happening)\b"),
+    "food": re.compile(r"\b(food|restaurants?|eat|cuisine|dining)\b"),
+    "activities": re.compile(r"\b(things to do|activit\w+|attractions?|museums?|sightseeing|nightlife|see)\b"),
+}
+
+MONTHS = {
+    "january": "jan", "february": "feb", "march": "mar", "april": "apr", "may": "may", "june": "jun",
+    "july": "jul", "august": "aug", "september": "sep", "october": "oct", "november": "nov", "december": "dec",
+}
+MONTH_ALIASES = {**MONTHS, **{abbr: abbr for abbr in MONTHS.values()}, "sept": "sep"}
+
+DATE_PATTERN = re.compile(
+    r"\b(" + "|".join(sorted(MONTH_ALIASES, key=len, reverse=True)) +
+    r"|\d{4}-\d{2}-\d{2}|next (?:week|weekend|month)|this (?:week|weekend|month)|tomorrow|today)\b",
+    re.IGNORECASE
+)
+# Lookahead so overlapping candidates are tried ("to fly to new york" -> "fly ...", then "new york")
+DESTINATION_PATTERN = re.compile(r"(?=\b(?:to|in|into|visit|visiting|for)\s+([a-z][a-z'\-]*(?:\s+[a-z][a-z'\-]*){0,3}))", re.IGNORECASE)
+DESTINATION_STOPWORDS = {
+    "in", "on", "at", "for", "to", "from", "next", "this", "the", "a", "an", "me", "us", "during", "around",
+    "with", "and", "or", "under", "please", "tomorrow", "today", "week", "weekend", "month", "there", "it",
+    "do", "see", "eat", "kids", "summer", "winter", "spring", "fall",
+    "fly", "go", "travel", "book", "find", "get", "know", "visit", "stay", "leave", "be", "have", "try",
+    "rain", "snow",
+} | set(MONTH_ALIASES)
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9']+")
+
+
+class RouteDecision(TypedDict):
+    intent: str
+    confidence: float
+    scores: Dict[str, float]
+    destination: Optional[str]
+    date: Optional[str]
+    latency_ms: float
+
+
+def _features(text: str) -> Dict[int, float]:
+    """Hashed word uni/bigrams and character trigrams, log-scaled and L2-normalized."""
+    tokens = TOKEN_PATTERN.findall(text.lower())
+    grams = list(tokens)
+    grams += [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+    for token in tokens:
+        padded = f"#{token}#"
+        grams += [padded[i:i + 3] for i in range(len(padded) - 2)]
+
+    counts = {}
+    for gram in grams:
+        bucket = zlib.crc32(gram.encode("utf-8")) % config.INTENT_HASH_BUCKETS
+        counts[bucket] = counts.get(bucket, 0) + 1
+
+    weights = {bucket: 1.0 + math.log(count) for bucket, count in counts.items()}
+    norm = math.sqrt(sum(w * w for w in weights.values())) or 1.0
+    return {bucket: w / norm for bucket, w in weights.items()}
+
+
+def _build_weight_table(training: Dict[str, List[str]]) -> Dict[int, Tuple[float, ...]]:
+    """
+    Builds a bucket -> per-intent weight row table from normalized class centroids.
+    Scoring an utterance is then one pass over its features accumulating a score vector.
+    """
+    centroids = []
+    for intent in INTENTS:
+        centroid = {}
+        for utterance in training.get(intent, []):
+            for bucket, weight in _features(utterance).items():
+                centroid[bucket] = centroid.get(bucket, 0.0) + weight
+        norm = math.sqrt(sum(w * w for w in centroid.values())) or 1.0
+        centroids.append({bucket: w / norm for bucket, w in centroid.items()})
+
+    buckets = set().union(*centroids)
+    return {bucket: tuple(c.get(bucket, 0.0) for c in centroids) for bucket in buckets}
+
+
+WEIGHT_TABLE = _build_weight_table(TRAINING_UTTERANCES)
+
+
+def extract_date(text: str) -> Optional[str]:
+    """Extracts the date phrase as spoken (e.g. "june", "next week")."""
+    match = DATE_PATTERN.search(text or "")
+    return match.group(1).lower() if match else None
+
+
+def normalize_month(text: str) -> Optional[str]:
+    """Extracts a normalized date token (e.g. "may", "2025-05-20", "next week")."""
+    match = DATE_PATTERN.search(text or "")
+    if not match:
+        return None
+    value = match.group(1).lower()
+    return MONTH_ALIASES.get(value, value)
+
+
+def extract_destination(text: str) -> Optional[str]:
+    """Extracts the destination following "to"/"in"/"visit" (e.g. "flights to new york next week" -> "new york")."""
+    for match in DESTINATION_PATTERN.finditer(text or ""):
+        words = []
+        for word in match.group(1).lower().split():
+            if word in DESTINATION_STOPWORDS:
+                break
+            words.append(word)
+        if words:
+            return " ".join(words)
+    return None
+
+
+def _normalize_place(place: str) -> str:
+    place = (place or "").split(",")[0].lower()
+    return " ".join(TOKEN_PATTERN.findall(place))
+
+
+def flight_key(destination: str, date: str) -> Tuple[str, str]:
+    """Prefetch key shared by routed utterances and the orchestrator's flight tool calls."""
+    return ("flight", _normalize_place(destination), normalize_month(date) or " ".join(TOKEN_PATTERN.findall((date or "").lower())))
+
+
+def lifestyle_key(query: str) -> Optional[Tuple[str, str, str]]:
+    """Prefetch key for lifestyle questions: (category, destination). None if either can't be determined."""
+    categories = [name for name, pattern in LIFESTYLE_CATEGORIES.items() if pattern.search((query or "").lower())]
+    destination = extract_destination(query)
+    if not categories or not destination:
+        return None
+    return ("lifestyle", categories[0], _normalize_place(destination))
+
+
+def route(text: str) -> RouteDecision:
+    """Classifies a user utterance and extracts flight slots."""
+    start = time.perf_counter()
+    lowered = (text or "").lower()
+
+    scores = [0.0] * len(INTENTS)
+    for bucket, weight in _features(lowered).items():
+        row = WEIGHT_TABLE.get(bucket)
+        if row:
+            for i, w in enumerate(row):
+                scores[i] += weight * w
+
+    for i, intent in enumerate(INTENTS):
+        rule = KEYWORD_RULES.get(intent)
+        if rule and rule.search(lowered):
+            scores[i] += config.INTENT_KEYWORD_BOOST
+
+    # Softmax over scores for a calibrated-ish confidence
+    peak = max(scores)
+    exps = [math.exp((s - peak) / config.INTENT_SOFTMAX_TEMPERATURE) for s in scores]
+    total = sum(exps)
+    best = max(range(len(INTENTS)), key=lambda i: scores[i])
+
+    return {
+        "intent": INTENTS[best],
+        "confidence": exps[best] / total,
+        "scores": {intent: round(score, 4) for intent, score in zip(INTENTS, scores)},
+        "destination": extract_destination(text),
+        "date": extract_date(text),
+        "latency_ms": (time.perf_counter() - start) * 1000,
+    }
+
+
+def should_predispatch(decision: RouteDecision) -> bool:
+    """True when the decision is confident and complete enough to start a specialist call early."""
+    if decision["confidence"] < config.INTENT_PREDISPATCH_MIN_CONFIDENCE:
+        return False
+    if decision["intent"] == FLIGHT:
+        return bool(decision["destination"] and decision["date"])
+    if decision["intent"] == LIFESTYLE:
+        return bool(decision["destination"])
+    return False
@@ -1,12 +1,19 @@
 import asyncio
+import contextvars
 import time
 
 # Global queue for logs
 log_queue = asyncio.Queue()
 
+# Per-request log destination (e.g. a text SSE stream); falls back to the global queue
+log_sink = contextvars.ContextVar("log_sink", default=None)
+
+def _log_target():
+    return log_sink.get() or log_queue
+
 def log_tool_start(tool_name, args):
     try:
-        log_queue.put_nowait({
+        _log_target().put_nowait({
             "type": "subagent_start",
             "agent": tool_name,
             "args": args,
@@ -15,14 +22,34 @@ def log_tool_start(tool_name, args):
     except Exception:
         pass
 
-def log_tool_complete(tool_name, result, duration):
+def log_tool_complete(tool_name, result, duration, ui=None):
     try:
-        log_queue.put_nowait({
+        entry = {
             "type": "subagent_complete",
             "agent": tool_name,
             "result": result,
             "duration": duration,
             "timestamp": time.time()
-        })
+        }
+        if ui is not None:
+            entry["ui"] = ui  # Rich display payload (the model only sees the compact tool result)
+        _log_target().put_nowait(entry)
+    except Exception:
+        pass
+
+def log_subagent_progress(tool_name, progress, loop=None):
+    """Queues a partial subagent result. Pass the event loop when calling from a worker thread."""
+    entry = {
+        "type": "subagent_progress",
+        "agent": tool_name,
+        "progress": progress,
+        "timestamp": time.time()
+    }
+    try:
+        target = _log_target()
+        if loop is not None:
+            loop.call_soon_threadsafe(target.put_nowait, entry)
+        else:
+            target.put_nowait(entry)
     except Exception:
-        pass
\ No newline at end of file
+        pass
@@ -0,0 +1,95 @@
+"""
+Memory budget helpers for long-lived sessions.
+Estimates the footprint of ADK session history and compacts it once it grows past the configured limits.
+"""
+
+import json
+from typing import Any, Callable, Optional
+import config
+
+# Rough fixed cost of an event (ids, timestamps, actions) on top of its payload
+EVENT_OVERHEAD_BYTES = 256
+
+
+def _payload_bytes(value) -> int:
+    """Approximate serialized size of a function call/response payload."""
+    if not value:
+        return 0
+    try:
+        return len(json.dumps(value, default=str))
+    except Exception:
+        return len(str(value))
+
+
+def estimate_event_bytes(event) -> int:
+    """Cheap size estimate of a single ADK event (text, audio and tool payloads)."""
+    size = EVENT_OVERHEAD_BYTES
+
+    content = getattr(event, "content", None)
+    for part in (getattr(content, "parts", None) or []):
+        if getattr(part, "text", None):
+            size += len(part.text)
+        inline_data = getattr(part, "inline_data", None)
+        if inline_data is not None and getattr(inline_data, "data", None):
+            size += len(inline_data.data)
+        function_call = getattr(part, "function_call", None)
+        if function_call is not None:
+            size += _payload_bytes(getattr(function_call, "args", None))
+        function_response = getattr(part, "function_response", None)
+        if function_response is not None:
+            size += _payload_bytes(getattr(function_response, "response", None))
+
+    for attr in ("input_transcription", "output_transcription"):
+        transcription = getattr(event, attr, None)
+        if transcription is not None and getattr(transcription, "text", None):
+            size += len(transcription.text)
+
+    return size
+
+
+def estimate_session_bytes(session) -> int:
+    """Approximate size of a session's event history."""
+    if session is None:
+        return 0
+    return sum(estimate_event_bytes(event) for event in (getattr(session, "events", None) or []))
+
+
+def get_stored_session(session_service, app_name: str, user_id: str, session_id: str):
+    """
+    Returns the session object held by an InMemorySessionService.
+    get_session() hands out deep copies, so trimming history has to happen on the stored instance.
+    """
+    sessions = getattr(session_service, "sessions", None)
+    if not isinstance(sessions, dict):
+        return None
+    return sessions.get(app_name, {}).get(user_id, {}).get(session_id)
+
+
+def compact_events(events: list,
+                   max_events: int = config.SESSION_MAX_EVENTS,
+                   max_bytes: int = config.SESSION_MEMORY_BUDGET_BYTES,
+                   pinned: int = 0,
+                   fold: Optional[Callable[[Any], None]] = None) -> int:
+    """
+    Drops the oldest events in place until the history fits both budgets.
+    The first `pinned` events (e.g. a leading conversation summary) and the most recent event are always kept.
+    If fold is given, it is called with each event before it is dropped. Returns the number of events removed.
+    """
+    if len(events) <= pinned:
+        return 0
+
+    sizes = [estimate_event_bytes(event) for event in events]
+    end = pinned + max(0, len(events) - max_events)
+    total = sum(sizes[:pinned]) + sum(sizes[end:])
+    while total > max_bytes and end < len(events) - 1:
+        total -= sizes[end]
+        end += 1
+    end = min(end, len(events) - 1)
+
+    if end <= pinned:
+        return 0
+    if fold is not None:
+        for event in events[pinned:end]:
+            fold(event)
+    del events[pinned:end]
+    return end - pinned
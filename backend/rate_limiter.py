@@ -0,0 +1,208 @@
+"""
+Client-side rate limiting for model and tool calls.
+Token buckets per model and per tool, round-robin fairness across sessions, adaptive backoff on 429s,
+and a maximum queue wait after which calls fail fast.
+Buckets are thread-safe: subagent model calls run on a separate event loop from the Live sessions.
+"""
+
+import asyncio
+import contextvars
+import itertools
+import re
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Optional
+import config
+
+# Session the current call is made on behalf of (set by SessionManager / the subagent runner)
+current_session = contextvars.ContextVar("current_session", default="anonymous")
+
+POLL_INTERVAL_SECONDS = 0.02
+
+# Error text of a quota rejection; a bare "429" also appears in flight numbers (UA429), ports and ids
+QUOTA_ERROR_TEXT = re.compile(r"\bRESOURCE_EXHAUSTED\b|\b429 Too Many Requests\b", re.IGNORECASE)
+
+
+class RateLimitExceeded(Exception):
+    """Raised when a queued call exceeds its maximum wait."""
+
+    def __init__(self, bucket: str, waited: float):
+        super().__init__(f"Rate limit for {bucket} exceeded after waiting {waited:.1f}s")
+        self.bucket = bucket
+        self.waited = waited
+
+
+def is_quota_error(error: Exception) -> bool:
+    """True for upstream 429 / RESOURCE_EXHAUSTED errors."""
+    if getattr(error, "code", None) == 429 or getattr(error, "status_code", None) == 429:
+        return True
+    return bool(QUOTA_ERROR_TEXT.search(str(error)))
+
+
+class TokenBucket:
+    """Token bucket with per-session FIFO queues served round-robin, and AIMD adaptation on 429s."""
+
+    def __init__(self, name: str, rate: float, capacity: float):
+        self.name = name
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+        self._queues = OrderedDict()  # session -> deque of tickets, in round-robin order
+        self._tickets = itertools.count()
+        self._rate_scale = 1.0
+        self._paused_until = 0.0
+        self._consecutive_throttles = 0
+        self.granted = 0
+        self.rejected = 0
+        self.throttled = 0
+
+    def _refill(self, now: float):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate * self._rate_scale)
+        self._updated = now
+
+    def enqueue(self, session: str) -> tuple:
+        with self._lock:
+            ticket = (session, next(self._tickets))
+            self._queues.setdefault(session, deque()).append(ticket)
+            return ticket
+
+    def cancel(self, ticket: tuple):
+        with self._lock:
+            queue = self._queues.get(ticket[0])
+            if queue and ticket in queue:
+                queue.remove(ticket)
+                if not queue:
+                    del self._queues[ticket[0]]
+
+    def try_take(self, ticket: tuple) -> float:
+        """Takes a token for the ticket if it's next in line. Returns 0 when granted, else a suggested wait."""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            if now < self._paused_until:
+                return self._paused_until - now
+
+            session = next(iter(self._queues), None)
+            if session != ticket[0] or self._queues[session][0] != ticket:
+                return POLL_INTERVAL_SECONDS
+            if self._tokens < 1:
+                return (1 - self._tokens) / (self.rate * self._rate_scale)
+
+            self._tokens -= 1
+            self.granted += 1
+            queue = self._queues.pop(session)
+            queue.popleft()
+            if queue:
+                self._queues[session] = queue  # Re-append: the session goes to the back of the rotation
+            return 0.0
+
+    def refund(self):
+        """Returns a token taken for a call that never happened."""
+        with self._lock:
+            self._tokens = min(self.capacity, self._tokens + 1)
+
+    def report_throttled(self):
+        """Upstream 429: halve the rate and pause the bucket with exponential backoff."""
+        with self._lock:
+            self.throttled += 1
+            self._consecutive_throttles += 1
+            self._rate_scale = max(config.RATE_LIMIT_MIN_RATE_SCALE, self._rate_scale / 2)
+            backoff = min(config.RATE_LIMIT_BACKOFF_MAX_SECONDS,
+                          config.RATE_LIMIT_BACKOFF_BASE_SECONDS * 2 ** (self._consecutive_throttles - 1))
+            self._paused_until = max(self._paused_until, time.monotonic() + backoff)
+            self._tokens = 0
+
+    def report_success(self):
+        with self._lock:
+            self._consecutive_throttles = 0
+            self._rate_scale = min(1.0, self._rate_scale + config.RATE_LIMIT_RECOVERY_STEP)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            self._refill(time.monotonic())
+            return {
+                "rate": self.rate,
+                "capacity": self.capacity,
+                "effective_rate": self.rate * self._rate_scale,
+                "tokens": round(self._tokens, 2),
+                "queued": sum(len(q) for q in self._queues.values()),
+                "queued_sessions": len(self._queues),
+                "paused_for": max(0.0, round(self._paused_until - time.monotonic(), 2)),
+                "granted": self.granted,
+                "rejected": self.rejected,
+                "throttled": self.throttled,
+            }
+
+
+_buckets = {}
+_buckets_lock = threading.Lock()
+
+
+def _limits_for(name: str) -> tuple:
+    kind, _, key = name.partition(":")
+    if kind == "model":
+        if key == config.ORCHESTRATOR_MODEL:
+            return config.ORCHESTRATOR_MODEL_RATE_LIMIT
+        return config.SUBAGENT_MODEL_RATE_LIMIT
+    return config.TOOL_RATE_LIMITS.get(key, (4.0, 8))
+
+
+def get_bucket(name: str) -> TokenBucket:
+    """Returns the bucket for "model:<model name>" or "tool:<tool name>", creating it from config."""
+    with _buckets_lock:
+        if name not in _buckets:
+            rate, capacity = _limits_for(name)
+            _buckets[name] = TokenBucket(name, rate, capacity)
+        return _buckets[name]
+
+
+async def acquire(*names: str, session: Optional[str] = None,
+                  max_wait: float = config.RATE_LIMIT_MAX_WAIT_SECONDS):
+    """
+    Waits for a token from each named bucket, in order. Raises RateLimitExceeded after max_wait
+    (tokens already taken from earlier buckets are refunded).
+    """
+    session = session or current_session.get()
+    deadline = time.monotonic() + max_wait
+    taken = []
+    try:
+        for name in names:
+            bucket = get_bucket(name)
+            ticket = bucket.enqueue(session)
+            try:
+                while True:
+                    wait = bucket.try_take(ticket)
+                    if wait == 0:
+                        taken.append(bucket)
+                        break
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        bucket.rejected += 1
+                        raise RateLimitExceeded(name, max_wait)
+                    await asyncio.sleep(min(wait, remaining, 0.25))
+            except BaseException:
+                bucket.cancel(ticket)
+                raise
+    except BaseException:
+        for bucket in taken:
+            bucket.refund()
+        raise
+
+
+def report_result(error: Optional[Exception], *names: str):
+    """Feeds a call's outcome back into the named buckets (429s trigger backoff)."""
+    for name in names:
+        bucket = get_bucket(name)
+        if error is None:
+            bucket.report_success()
+        elif is_quota_error(error):
+            bucket.report_throttled()
+
+
+def rate_limit_status() -> dict:
+    with _buckets_lock:
+        buckets = dict(_buckets)
+    return {name: bucket.snapshot() for name, bucket in buckets.items()}
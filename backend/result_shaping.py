@@ -0,0 +1,134 @@
+"""
+Result shaping for specialist tools.
+The Live model gets a compact, size-bounded payload; the UI gets a separate rich payload.
+"""
+
+import json
+from typing import Any, Dict, List, Optional, TypedDict
+import config
+
+
+class FlightRecord(TypedDict, total=False):
+    flight: str
+    airline: str
+    price: float
+    currency: str
+    departure: str
+    arrival: str
+    duration: str
+    seats: int
+    cabin: str
+
+
+class SpecialistResult(TypedDict, total=False):
+    summary: str
+    flights: List[FlightRecord]
+    truncated: bool
+
+
+# Fields the orchestrator needs to speak about a flight
+MODEL_FLIGHT_FIELDS = ("flight", "airline", "price", "currency", "departure", "arrival", "duration")
+
+TRUNCATION_MARKER = "..."
+
+
+def flight_record(raw: Dict[str, Any]) -> FlightRecord:
+    """Normalizes a raw flight dict (e.g. from check_flight_availability) into a FlightRecord."""
+    record: FlightRecord = {}
+    for field in ("flight", "airline", "currency", "departure", "arrival", "duration"):
+        if raw.get(field) is not None:
+            record[field] = str(raw[field])
+    if raw.get("price") is not None:
+        record["price"] = raw["price"]
+    if raw.get("seats") is not None:
+        record["seats"] = raw["seats"]
+    if raw.get("class") is not None:
+        record["cabin"] = str(raw["class"])
+    return record
+
+
+def collect_flights(tool_results: List[tuple]) -> List[FlightRecord]:
+    """Extracts unique flight records from (tool_name, result) pairs, cheapest first."""
+    flights = {}
+    for _, result in tool_results:
+        if isinstance(result, dict) and result.get("flight"):
+            record = flight_record(result)
+            flights.setdefault(record["flight"], record)
+    return sorted(flights.values(), key=lambda f: (f.get("price") is None, f.get("price") or 0, f["flight"]))
+
+
+def _encoded_size(payload: dict) -> int:
+    return len(json.dumps(payload, separators=(",", ":"), ensure_ascii=False).encode("utf-8"))
+
+
+def _truncate_text(text: str, max_chars: int) -> str:
+    """Cuts text at a word boundary so it fits in max_chars (including the marker)."""
+    if len(text) <= max_chars:
+        return text
+    cut = max(0, max_chars - len(TRUNCATION_MARKER))
+    head = text[:cut]
+    if " " in head:
+        head = head[:head.rfind(" ")]
+    return head.rstrip() + TRUNCATION_MARKER
+
+
+def shape_for_model(summary: str,
+                    flights: Optional[List[FlightRecord]] = None,
+                    max_bytes: int = config.SPECIALIST_RESULT_MAX_BYTES) -> SpecialistResult:
+    """
+    Builds the compact payload returned to the orchestrator.
+    Truncation is deterministic: extra flights are dropped first (most expensive first), then the summary
+    is cut at a word boundary until the compact JSON encoding fits max_bytes.
+    """
+    payload: SpecialistResult = {"summary": (summary or "").strip(), "truncated": False}
+    if flights is not None:
+        payload["flights"] = [
+            {field: f[field] for field in MODEL_FLIGHT_FIELDS if field in f}
+            for f in flights[:config.SPECIALIST_RESULT_MAX_FLIGHTS]
+        ]
+        payload["truncated"] = len(flights) > config.SPECIALIST_RESULT_MAX_FLIGHTS
+
+    if _encoded_size(payload) <= max_bytes:
+        return payload
+
+    payload["truncated"] = True
+
+    # Keep at least one flight if the summary alone can't make room
+    while payload.get("flights") and len(payload["flights"]) > 1:
+        without_summary = dict(payload, summary="")
+        if _encoded_size(without_summary) <= max_bytes // 2:
+            break
+        payload["flights"] = payload["flights"][:-1]
+
+    payload["summary"] = _fit_summary(payload, max_bytes)
+    return payload
+
+
+def _fit_summary(payload: SpecialistResult, max_bytes: int) -> str:
+    """
+    The longest word-boundary cut of payload's summary whose encoded payload fits max_bytes.
+    Sizes are UTF-8 bytes but cuts are in characters, so the cut length is binary searched.
+    """
+    summary = payload["summary"]
+    if not summary or _encoded_size(payload) <= max_bytes:
+        return summary
+
+    best = ""
+    low, high = 0, len(summary) - 1
+    while low <= high:
+        mid = (low + high) // 2
+        candidate = _truncate_text(summary, mid)
+        if candidate != TRUNCATION_MARKER and _encoded_size(dict(payload, summary=candidate)) <= max_bytes:
+            best = candidate
+            low = mid + 1
+        else:
+            high = mid - 1
+    return best
+
+
+def ui_payload(agent: str, summary: str, flights: Optional[List[FlightRecord]] = None) -> Dict[str, Any]:
+    """Rich payload for the frontend (full specialist text and every flight record)."""
+    payload = {"agent": agent, "summary": summary}
+    if flights is not None:
+        payload["flights"] = flights
+    return payload
@@ -1,6 +1,9 @@
 import asyncio
 import json
+import re
 import time
+import uuid
+from collections import deque
 import traceback
 import sys
 from fastapi import WebSocket, WebSocketDisconnect
@@ -9,14 +12,31 @@ from google.adk.runners import InMemoryRunner
 from google.adk.sessions import InMemorySessionService
 from google.adk.agents import LiveRequestQueue
 from google.adk.agents.run_config import RunConfig, StreamingMode
-from agents import nomad_agent
+from agents import get_nomad_agent
 from logger import log_queue, log_tool_start, log_tool_complete
+from memory_budget import compact_events, estimate_session_bytes, get_stored_session
+from intent_router import FLIGHT, LIFESTYLE, route, should_predispatch
+from tools import cancel_prefetches, cancel_session_work, prefetch_flights, prefetch_lifestyle
+from rate_limiter import RateLimitExceeded, acquire, current_session, report_result
+from context_compaction import (
+    ConversationSummary, compact_context, estimate_session_tokens, has_summary, live_compression_settings,
+    upsert_summary_event
+)
+from user_memory import (
+    extract_preferences, load_endpointing, load_user_memory, record_trip, render_profile, save_endpointing,
+    save_preferences
+)
+from turn_taking import EndpointTracker
+from audio_cache import get_audio_cache
 import config
 
 # Mapping of tool names to subagent names
 TOOL_TO_SUBAGENT = {
     "consult_flight_specialist": "Flight Specialist",
     "consult_lifestyle_specialist": "Lifestyle Specialist",
+    "stream_flight_specialist": "Flight Specialist",
+    "stream_lifestyle_specialist": "Lifestyle Specialist",
+    "compare_travel_options": "Specialist Team",
     "check_flight_availability_subagent": "Flight Specialist",  # Legacy
     "search_lifestyle_subagent": "Lifestyle Specialist",  # Legacy
     "google_search": "Lifestyle Specialist"  # Fallback if direct google_search is used
@@ -24,13 +44,46 @@ TOOL_TO_SUBAGENT = {
 
 APP_NAME = config.APP_NAME
 
+# Tools whose results carry flights worth remembering as trip history
+FLIGHT_TOOLS = {
+    "consult_flight_specialist", "consult_flight_specialist_fallback", "stream_flight_specialist",
+    "compare_travel_options",
+}
+
+
+def _decode_tool_result(result):
+    """Tool results may arrive as a dict, a JSON string (streaming tools) or {"result": <JSON string>}."""
+    if isinstance(result, dict) and set(result) == {"result"}:
+        result = result["result"]
+    if isinstance(result, str):
+        try:
+            result = json.loads(result)
+        except ValueError:
+            return None
+    return result if isinstance(result, dict) else None
+
+# Live sessions keyed by session_id (used by the /debug/memory view)
+ACTIVE_SESSIONS = {}
+
 class SessionManager:
     def __init__(self, websocket: WebSocket):
         self.websocket = websocket
-        self.runner = InMemoryRunner(app_name=APP_NAME, agent=nomad_agent)
+        self.runner = InMemoryRunner(app_name=APP_NAME, agent=get_nomad_agent())
         self.session_service = self.runner.session_service
         self.live_request_queue = None
         self.session_id = None
+        self.user_id = None
+        self.remember_user = False  # Only identified users (user_id sent in setup) get persistent memory
+        self.session = None  # Session object handed to run_live (ADK appends events to it)
+        self.events_compacted = 0  # Total events dropped by memory budget enforcement
+
+        # Context window tracking
+        self.context_summary = ConversationSummary()
+        self.context_tokens = 0  # Approximate tokens in the session history
+        self.reported_context_tokens = 0  # Prompt tokens reported by the Live API (when available)
+        self.resumption_handle = None  # Latest Live API session resumption handle
+        self.live_reconnects = 0
+        self.turn_latencies = deque(maxlen=config.CONTEXT_LATENCY_SAMPLES)  # (context_tokens, ttfb_seconds) per turn
 
         # Simplified timing variables
         self.user_input_end_time = None  # When last user byte received
@@ -44,11 +97,22 @@ class SessionManager:
         self.waiting_for_tools = False  # Track if we're waiting for tool completion
         self.ttfb_recorded = False  # Track if we've already recorded TTFB for this turn
         self.tool_call_seen = False  # Track if we've seen a tool call this turn
-        self.vad_silence_duration_ms = 1000  # Default fallback - actual value comes from frontend
+        self.vad_silence_duration_ms = 1000  # Default fallback - actual value comes from frontend (or is learned)
+        self.endpointing = EndpointTracker(self.vad_silence_duration_ms)  # Pause / false-endpoint measurements
+        self.turn_routed = False  # Track if the intent router has seen this turn's final transcript
+        self.agent_speaking = False  # Model audio is being forwarded for the current response
+        self.response_started_at = None  # When the current response (audio or tool call) started
+        self.tool_args = {}  # Arguments per function call id (tool name if the call has none), for trip history
+        self.voice_name = "Aoede"
+        self.ack_played = False  # A cached acknowledgement already covered this turn
+
+        # Outbound model audio, drained by send_audio_loop (purged on barge-in)
+        self.outbound_audio = asyncio.Queue()
 
     async def start(self):
         """Starts the ADK Live session and manages the bi-directional stream."""
         log_task = None
+        audio_task = None
         try:
             # Wait for initial setup message from client
             setup_msg = await self.websocket.receive_text()
@@ -58,18 +122,67 @@ class SessionManager:
             # Extract settings
             setup_config = setup_data.get("setup", {})
             voice_name = setup_config.get("voice_name", "Aoede")
+            self.voice_name = voice_name
             vad_settings = setup_config.get("vad_settings", {})
             self.vad_silence_duration_ms = vad_settings.get("silence_duration_ms", 1000)
-            print(f"INFO: VAD silence duration set to {self.vad_silence_duration_ms}ms")
+            self.endpointing = EndpointTracker(
+                self.vad_silence_duration_ms,
+                prefix_padding_ms=vad_settings.get("prefix_padding_ms", 300),
+                start_sensitivity=setup_config.get("start_of_speech_sensitivity", "START_SENSITIVITY_LOW"),
+                end_sensitivity=setup_config.get("end_of_speech_sensitivity", "END_SENSITIVITY_LOW"),
+            )
+
+            user_id = self.resolve_user_id(setup_config.get("user_id"))
+            self.user_id = user_id
 
-            user_id = "user_123" # Demo user ID
+            # Load remembered facts in a thread while we wait for a session slot
+            profile_task = None
+            if self.remember_user:
+                profile_task = asyncio.create_task(asyncio.to_thread(self.load_user_context))
 
-            # Create Session
+            # Queue for a Live session slot instead of failing in bulk when we're near quota
+            try:
+                await acquire(f"model:{config.ORCHESTRATOR_MODEL}", session=user_id,
+                              max_wait=config.SESSION_START_MAX_WAIT_SECONDS)
+            except RateLimitExceeded as e:
+                print(f"WARNING: Session start rate limited: {e}")
+                await self.websocket.send_text(json.dumps({
+                    "type": "error",
+                    "message": "Nomad is very busy right now. Please try again in a moment."
+                }))
+                return
+
+            # Create Session (seeded with whatever profile loaded in time; never blocks the connect for long)
+            user_profile, learned_vad = "", None
+            if profile_task:
+                try:
+                    user_profile, learned_vad = await asyncio.wait_for(
+                        asyncio.shield(profile_task), timeout=config.USER_MEMORY_LOAD_TIMEOUT_SECONDS
+                    )
+                except asyncio.TimeoutError:
+                    sys.stderr.write("[USER_MEMORY] Profile load timed out - starting without it\n")
+                    sys.stderr.flush()
+                except Exception as e:
+                    sys.stderr.write(f"[USER_MEMORY] Profile load failed: {e}\n")
+                    sys.stderr.flush()
             session = await self.session_service.create_session(
                 app_name=APP_NAME,
-                user_id=user_id
+                user_id=user_id,
+                state={"user_profile": user_profile}
             )
+
+            # Start from the activity detection settings learned for this speaker, unless the client set them
+            # explicitly (it sends vad_settings.adaptive = true while the user hasn't touched the slider)
+            explicit_vad = "silence_duration_ms" in vad_settings and not vad_settings.get("adaptive", False)
+            if learned_vad and config.ADAPTIVE_VAD_ENABLED and not explicit_vad:
+                self.endpointing.apply_learned(learned_vad)
+            self.vad_silence_duration_ms = self.endpointing.silence_duration_ms
+            print(f"INFO: VAD silence duration set to {self.vad_silence_duration_ms}ms")
             self.session_id = session.id
+            self.session = session
+            ACTIVE_SESSIONS[self.session_id] = self
+            # Tool calls made from this session's tasks queue fairly under this key
+            current_session.set(self.session_id)
 
             # Create Live Request Queue
             self.live_request_queue = LiveRequestQueue()
@@ -92,45 +205,101 @@ class SessionManager:
                 streaming_mode=StreamingMode.BIDI,
                 output_audio_transcription=types.AudioTranscriptionConfig(), 
                 input_audio_transcription=types.AudioTranscriptionConfig(),
-                realtime_input_config=types.RealtimeInputConfig(
-                    turn_coverage=types.TurnCoverage.TURN_INCLUDES_ALL_INPUT
-                )
+                realtime_input_config=(
+                    self.endpointing.realtime_input_config() if config.ADAPTIVE_VAD_ENABLED
+                    else types.RealtimeInputConfig(turn_coverage=types.TurnCoverage.TURN_INCLUDES_ALL_INPUT)
+                ),
+                # Context window compression / session resumption, where this ADK version supports them
+                **{
+                    key: value for key, value in live_compression_settings().items()
+                    if key in RunConfig.model_fields
+                }
             )
             print(f"DEBUG: RunConfig created: {run_config}")
 
-            # Start the Runner (returns an async generator of events)
-            live_events = self.runner.run_live(
-                run_config=run_config,
-                session=session,
-                live_request_queue=self.live_request_queue
-            )
-
             # Start input loop
             input_task = asyncio.create_task(self.receive_from_client())
 
             # Start log streaming loop
             log_task = asyncio.create_task(self.stream_logs())
 
-            # Process output events
-            async for event in live_events:
-                await self.process_event(event)
+            await self.send_vad_tuning()
+
+            # Instant greeting from the snippet cache (no model turn)
+            if config.AUDIO_CACHE_GREETING:
+                await self.play_snippet("greeting")
+
+            # Start outbound audio loop
+            audio_task = asyncio.create_task(self.send_audio_loop())
+
+            # Process output events. If the Live connection drops while the client is still here, reconnect:
+            # with a resumption handle the server restores its own context, otherwise ADK sends the (compacted)
+            # session history, summary first, on the new connection.
+            while True:
+                # Start the Runner (returns an async generator of events)
+                live_events = self.runner.run_live(
+                    run_config=run_config,
+                    session=session,
+                    live_request_queue=self.live_request_queue
+                )
+                try:
+                    async for event in live_events:
+                        await self.process_event(event)
+                    break
+                except Exception as e:
+                    if not self.can_reconnect(input_task):
+                        raise
+                    self.live_reconnects += 1
+                    run_config = self.resumed_run_config(run_config)
+                    sys.stderr.write(f"[LIVE] Connection lost ({e}); reconnecting "
+                                     f"({self.live_reconnects}/{config.LIVE_MAX_RECONNECTS}, "
+                                     f"{'resuming' if self.resumption_handle else 'replaying history'})\n")
+                    sys.stderr.flush()
 
             # If loop ends, cancel tasks
             input_task.cancel()
             log_task.cancel()
+            audio_task.cancel()
 
         except Exception as e:
             print(f"ERROR: Session error: {e}")
             traceback.print_exc()
+            report_result(e, f"model:{config.ORCHESTRATOR_MODEL}")
             await self.websocket.close()
         finally:
             if log_task: log_task.cancel()
+            if audio_task: audio_task.cancel()
+            if self.session_id:
+                ACTIVE_SESSIONS.pop(self.session_id, None)
+                # Unclaimed pre-dispatched specialist runs would otherwise keep using quota
+                cancel_prefetches(self.session_id)
+            # Next session for this speaker starts from what we learned in this one
+            if config.ADAPTIVE_VAD_ENABLED and self.endpointing.turns >= config.VAD_MIN_TURNS:
+                self.remember(save_endpointing, self.endpointing.report())
 
     async def process_event(self, event):
         """Process different types of events from the ADK Live stream."""
         try:
             is_partial = getattr(event, "partial", False)
 
+            # Track context size reported by the Live API
+            usage = getattr(event, "usage_metadata", None)
+            if usage is not None and getattr(usage, "prompt_token_count", None):
+                self.reported_context_tokens = usage.prompt_token_count
+
+            # Keep the latest resumption handle so a dropped connection can resume server-side state
+            resumption = getattr(event, "live_session_resumption_update", None)
+            if resumption is not None and getattr(resumption, "new_handle", None) and getattr(resumption, "resumable", True):
+                self.resumption_handle = resumption.new_handle
+
+            # Server-side interruption (the Live API detected the user talking over the model)
+            if getattr(event, "interrupted", False):
+                await self.handle_barge_in("server_interrupted")
+
+            # Drop timers for tool calls whose responses never arrived
+            if self.current_tool_start_times:
+                self.expire_tool_timers()
+
             # Log every event type for debugging
             event_types = []
             if getattr(event, "tool_call", None):
@@ -212,6 +381,14 @@ class SessionManager:
             if tool_response:
                 await self.handle_tool_response(tool_response)
 
+            # Track when the current response started (None while no response is active)
+            if not (self.agent_speaking or self.waiting_for_tools):
+                self.response_started_at = None
+            elif self.response_started_at is None:
+                self.response_started_at = time.time()
+                # The model started answering (audio or a tool call): the server endpointed the user's turn
+                self.endpointing.on_response_start(self.response_started_at)
+
         except Exception as e:
             print(f"Error processing event: {e}")
 
@@ -223,15 +400,32 @@ class SessionManager:
              input_transcription = getattr(server_content, "input_transcription", None)
 
         if input_transcription and hasattr(input_transcription, 'text') and input_transcription.text:
+            self.endpointing.on_user_chunk()
+
+            # New user speech while a response is playing stops playback. Chunks within BARGE_IN_GRACE_SECONDS of
+            # the response starting are the tail of the user's own turn. Subagent work is left running: late
+            # transcription of the request, or an "okay" during a tool wait, mustn't cancel the run it triggered
+            # (the server's interrupted signal does that).
+            if (self.response_started_at is not None
+                    and time.time() - self.response_started_at >= config.BARGE_IN_GRACE_SECONDS
+                    and len(input_transcription.text.strip()) >= config.BARGE_IN_MIN_TRANSCRIPT_CHARS):
+                await self.handle_barge_in("user_speech", cancel_work=False)
+
             # CRITICAL: First user transcription means new user speech detected
             # Reset timing flags here (server's VAD has detected actual speech, not noise)
             if not self.has_new_user_input:
                 self.user_input_end_time = time.time()
                 self.has_new_user_input = True
                 self.ttfb_recorded = False
+                self.turn_routed = False
                 sys.stderr.write(f"[USER_SPEECH] User speech detected, reset timing at {self.user_input_end_time}\n")
                 sys.stderr.flush()
 
+            # Final transcript of the user's turn - route it locally
+            if getattr(input_transcription, "finished", False):
+                self.endpointing.on_user_final(input_transcription.text)
+                self.route_user_transcript(input_transcription.text)
+
             # print(f"User streaming transcript: {input_transcription.text}")
             await self.websocket.send_text(json.dumps({
                 "type": "transcript_partial",
@@ -278,13 +472,12 @@ class SessionManager:
                 sys.stderr.write(f"[TTFB] Total latency: {total_latency:.3f}s (Tool time: {tool_execution_time:.3f}s)\n")
                 sys.stderr.flush()
 
-                await self.websocket.send_text(json.dumps({
-                    "type": "ttfb",
-                    "duration": total_latency
-                }))
+                await self.send_ttfb(total_latency)
                 self.ttfb_recorded = True
 
             self.response_in_progress = False
+            self.agent_speaking = False
+            self.ack_played = False
             # Reset timing and state for next turn
             # IMPORTANT: Don't reset user_input_end_time, has_new_user_input, or ttfb_recorded here!
             # These should ONLY be reset when we actually receive new user input
@@ -296,10 +489,17 @@ class SessionManager:
             # DO NOT reset ttfb_recorded here - only reset on new user input!
             self.current_tool_start_times.clear()
 
+            # Keep the session history within its memory budget
+            self.enforce_memory_budget()
+
+            await self.send_vad_tuning()
+
             # User input transcription
             input_transcription = getattr(turn_complete, "input_audio_transcription", None)
             if input_transcription and hasattr(input_transcription, 'text') and input_transcription.text:
                 # print(f"User transcript: {input_transcription.text}")
+                self.endpointing.on_user_final(input_transcription.text)
+                self.route_user_transcript(input_transcription.text)
                 # Send user transcript to frontend
                 await self.websocket.send_text(json.dumps({
                     "type": "transcript",
@@ -331,6 +531,294 @@ class SessionManager:
                         "role": "agent"
                     }))
 
+    async def send_audio_loop(self):
+        """Forwards queued model audio to the client (the queue is purged on barge-in)."""
+        try:
+            while True:
+                chunk = await self.outbound_audio.get()
+                await self.websocket.send_bytes(chunk)
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            print(f"ERROR: Audio send loop failed: {e}")
+
+    async def handle_barge_in(self, reason, cancel_work=True):
+        """
+        Stops the interrupted response: purges audio not yet sent and tells the client, which stops playback
+        (audio already sent can only be cut off there). With cancel_work, in-flight subagent work is cancelled
+        and the tool wait ends too; otherwise only playback stops.
+        """
+        purged = 0
+        while not self.outbound_audio.empty():
+            self.outbound_audio.get_nowait()
+            purged += 1
+
+        cancelled = 0
+        if cancel_work and config.BARGE_IN_CANCEL_SUBAGENTS and self.session_id:
+            cancelled = cancel_session_work(self.session_id)
+
+        if not (purged or cancelled or self.agent_speaking or (cancel_work and self.waiting_for_tools)):
+            return
+
+        sys.stderr.write(f"[BARGE_IN] {reason}: purged {purged} audio chunks, cancelled {cancelled} subagent runs\n")
+        sys.stderr.flush()
+
+        self.agent_speaking = False
+        self.response_in_progress = False
+        # The interrupting speech starts a new user turn
+        self.has_new_user_input = False
+        if cancel_work:
+            self.response_started_at = None
+            self.waiting_for_tools = False
+            self.tool_call_seen = False
+            self.first_tool_start_time = None
+            self.last_tool_end_time = None
+            self.current_tool_start_times.clear()
+
+        await self.websocket.send_text(json.dumps({
+            "type": "interrupted",
+            "reason": reason,
+            "purged_audio_chunks": purged,
+            "cancelled_subagents": cancelled
+        }))
+
+    def resolve_user_id(self, raw_user_id):
+        """Uses the client's stable user_id when it sends one; otherwise an anonymous per-connection id."""
+        user_id = re.sub(r"[^A-Za-z0-9_.:@-]", "", str(raw_user_id or ""))[:128]
+        if user_id and config.USER_MEMORY_ENABLED:
+            self.remember_user = True
+            return user_id
+        return user_id or f"anon-{uuid.uuid4().hex[:12]}"
+
+    def load_user_context(self):
+        """
+        Blocking: renders this user's remembered preferences and trips and loads their learned activity detection
+        settings (run via asyncio.to_thread). Returns (profile, endpointing or None).
+        """
+        started = time.perf_counter()
+        profile = render_profile(load_user_memory(self.user_id))
+        endpointing = load_endpointing(self.user_id)
+        sys.stderr.write(f"[USER_MEMORY] Loaded profile for {self.user_id} ({len(profile)} chars) "
+                         f"in {(time.perf_counter() - started) * 1000:.1f}ms\n")
+        sys.stderr.flush()
+        return profile, endpointing
+
+    def remember(self, func, *args):
+        """Runs a user memory write off the event loop; failures are logged, never raised."""
+        if not self.remember_user:
+            return
+
+        async def _write():
+            try:
+                await asyncio.to_thread(func, self.user_id, *args)
+            except Exception as e:
+                sys.stderr.write(f"[USER_MEMORY] {func.__name__} failed: {e}\n")
+                sys.stderr.flush()
+
+        asyncio.create_task(_write())
+
+    def remember_trip(self, tool_name, result, call_id=None):
+        """Records a flight search (and its cheapest flight) in the user's trip history."""
+        if tool_name not in FLIGHT_TOOLS:
+            return
+        result = _decode_tool_result(result)
+        # Streaming tools report partial updates before the final result
+        if result is None or result.get("partial"):
+            return
+        args = self.tool_args.pop(call_id or tool_name, {})
+
+        # compare_travel_options: the cheapest option per (destination, date), already ranked by price
+        if "ranked_flights" in result:
+            cheapest = {}
+            for option in result["ranked_flights"]:
+                if isinstance(option, dict) and option.get("destination"):
+                    cheapest.setdefault((option["destination"], option.get("date")), option)
+            for (destination, date), flight in cheapest.items():
+                self.remember(record_trip, destination, date, flight)
+            return
+
+        if not args.get("destination"):
+            return
+        flights = [f for f in result.get("flights") or [] if isinstance(f, dict)]
+        cheapest = min(flights, key=lambda f: f.get("price", float("inf")), default=None)
+        self.remember(record_trip, args["destination"], args.get("date"), cheapest)
+
+    def route_user_transcript(self, text):
+        """Classifies the final user transcript and pre-dispatches obvious specialist calls."""
+        if self.turn_routed or not text:
+            return
+        self.turn_routed = True
+
+        preferences = extract_preferences(text)
+        if preferences:
+            self.remember(save_preferences, preferences)
+
+        if not config.INTENT_ROUTER_ENABLED:
+            return
+
+        decision = route(text)
+        sys.stderr.write(f"[ROUTER] {decision['intent']} ({decision['confidence']:.2f}) "
+                         f"dest={decision['destination']} date={decision['date']} in {decision['latency_ms']:.2f}ms\n")
+        sys.stderr.flush()
+
+        if not should_predispatch(decision):
+            return
+        if decision["intent"] == FLIGHT:
+            started = prefetch_flights(decision["destination"], decision["date"])
+        elif decision["intent"] == LIFESTYLE:
+            started = prefetch_lifestyle(text)
+        else:
+            started = False
+        if started:
+            sys.stderr.write(f"[ROUTER] Pre-dispatched {decision['intent']} specialist\n")
+            sys.stderr.flush()
+            # Fill the wait for the specialist with a cached acknowledgement
+            asyncio.create_task(self.play_ack(f"ack_{decision['intent']}"))
+
+    async def play_ack(self, intent):
+        """
+        Plays a cached acknowledgement clip, at most once per turn, and only before the model's own audio:
+        once the model is speaking (including its spoken acknowledgement of a tool call) the clip would land
+        mid-sentence or repeat it.
+        """
+        if self.ack_played or self.agent_speaking:
+            return
+        self.ack_played = True  # Claimed before awaiting so concurrent triggers don't both play
+        self.ack_played = await self.play_snippet(intent)
+
+    async def play_snippet(self, intent):
+        """
+        Queues a precomputed clip for this session's voice (no model turn needed) and sends its transcript.
+        Returns False on a cache miss.
+        """
+        if not config.AUDIO_CACHE_ENABLED:
+            return False
+        try:
+            cache = get_audio_cache()
+            snippet = cache.get(intent, self.voice_name) if cache else None
+        except OSError as e:
+            sys.stderr.write(f"[AUDIO_CACHE] Unavailable: {e}\n")
+            sys.stderr.flush()
+            return False
+        if snippet is None:
+            return False
+
+        # Chunked like model audio so a barge-in purges the rest of the clip. Not counted as model speech
+        # (agent_speaking), which only turn_complete clears: the user answering a clip isn't a barge-in.
+        for start in range(0, len(snippet.audio), config.AUDIO_CACHE_CHUNK_BYTES):
+            self.outbound_audio.put_nowait(bytes(snippet.audio[start:start + config.AUDIO_CACHE_CHUNK_BYTES]))
+
+        message = {"type": "transcript", "text": snippet.text, "role": "agent", "cached": True}
+        await self.websocket.send_text(json.dumps(message))
+        sys.stderr.write(f"[AUDIO_CACHE] Played {intent} ({self.voice_name}, {len(snippet.audio)} bytes)\n")
+        sys.stderr.flush()
+        return True
+
+    def expire_tool_timers(self, now=None):
+        """Drops tool start times older than TOOL_TIMER_TTL_SECONDS (responses that never arrived)."""
+        now = now or time.time()
+        expired = [
+            name for name, started in self.current_tool_start_times.items()
+            if now - started > config.TOOL_TIMER_TTL_SECONDS
+        ]
+        for name in expired:
+            del self.current_tool_start_times[name]
+            sys.stderr.write(f"[MEMORY] Dropped orphaned tool timer: {name}\n")
+            sys.stderr.flush()
+
+        if expired and not self.current_tool_start_times:
+            self.waiting_for_tools = False
+
+    async def send_vad_tuning(self):
+        """Reports the applied activity detection settings and what this session has measured so far."""
+        try:
+            await self.websocket.send_text(json.dumps({"type": "vad_tuning", **self.endpointing.report()}))
+        except Exception as e:
+            sys.stderr.write(f"[VAD] Failed to send tuning report: {e}\n")
+            sys.stderr.flush()
+
+    async def send_ttfb(self, total_latency):
+        """Sends the turn TTFB to the frontend and records it against the current session length."""
+        context_tokens = self.reported_context_tokens or self.context_tokens
+        self.turn_latencies.append((context_tokens, total_latency))
+        await self.websocket.send_text(json.dumps({
+            "type": "ttfb",
+            "duration": total_latency,
+            "context_tokens": context_tokens
+        }))
+
+    def can_reconnect(self, input_task) -> bool:
+        """Whether a dropped Live connection should be re-established (client still connected, retries left)."""
+        return (config.LIVE_SESSION_RESUMPTION and not input_task.done()
+                and self.live_reconnects < config.LIVE_MAX_RECONNECTS)
+
+    def resumed_run_config(self, run_config):
+        """RunConfig for the next connection, carrying the resumption handle when we have one."""
+        if not self.resumption_handle or "session_resumption" not in RunConfig.model_fields:
+            return run_config
+        return run_config.model_copy(update={
+            "session_resumption": types.SessionResumptionConfig(handle=self.resumption_handle)
+        })
+
+    def enforce_memory_budget(self):
+        """
+        Keeps the session history within budget.
+        Past CONTEXT_TOKEN_BUDGET older turns are folded into a rolling summary; SESSION_MAX_EVENTS and
+        SESSION_MEMORY_BUDGET_BYTES are then enforced as hard caps (dropped events are folded into the summary
+        first, and the summary itself is never dropped).
+        The Live API receives history only when a connection is opened, so the compacted history (summary
+        first) reaches the model when the session reconnects without a resumption handle.
+        """
+        if not self.session_id:
+            return
+
+        stored = get_stored_session(self.session_service, APP_NAME, self.user_id, self.session_id)
+        session = stored or self.session
+        if session is None or not session.events:
+            return
+
+        self.context_tokens = estimate_session_tokens(session)
+        if self.context_tokens > config.CONTEXT_TOKEN_BUDGET:
+            folded = compact_context(session.events, self.context_summary)
+            if folded:
+                tokens_before = self.context_tokens
+                self.context_tokens = estimate_session_tokens(session)
+                sys.stderr.write(f"[CONTEXT] Folded {folded} events into summary ({tokens_before} -> {self.context_tokens} tokens)\n")
+                sys.stderr.flush()
+
+        dropped = compact_events(
+            session.events, pinned=1 if has_summary(session.events) else 0, fold=self.context_summary.add_event
+        )
+        if dropped:
+            upsert_summary_event(session.events, self.context_summary)
+            self.events_compacted += dropped
+            self.context_tokens = estimate_session_tokens(session)
+            sys.stderr.write(f"[MEMORY] Compacted {dropped} events from session {self.session_id}\n")
+            sys.stderr.flush()
+
+        # ADK appends the same event objects to both the stored session and the one passed to run_live
+        if stored is not None and self.session is not None and self.session is not stored:
+            self.session.events[:] = stored.events
+
+    def memory_report(self) -> dict:
+        """Per-session memory estimate for the /debug/memory view."""
+        stored = get_stored_session(self.session_service, APP_NAME, self.user_id, self.session_id)
+        session = stored or self.session
+        return {
+            "session_id": self.session_id,
+            "user_id": self.user_id,
+            "events": len(session.events) if session else 0,
+            "event_bytes": estimate_session_bytes(session),
+            "events_compacted": self.events_compacted,
+            "pending_tool_timers": len(self.current_tool_start_times),
+            "pending_audio_chunks": self.outbound_audio.qsize(),
+            "budget_bytes": config.SESSION_MEMORY_BUDGET_BYTES,
+            "context_tokens": self.context_tokens,
+            "live_reconnects": self.live_reconnects,
+            "reported_context_tokens": self.reported_context_tokens,
+            "context_summary": self.context_summary.to_dict(),
+        }
+
     async def handle_content(self, content):
         """Handle content events (audio and text)."""
         role = "agent"
@@ -346,7 +834,8 @@ class SessionManager:
                 if hasattr(part, 'inline_data') and part.inline_data:
                     if hasattr(part.inline_data, 'data') and part.inline_data.data:
                         has_content = True
-                        await self.websocket.send_bytes(part.inline_data.data)
+                        self.agent_speaking = True
+                        self.outbound_audio.put_nowait(part.inline_data.data)
 
                 # Handle text content (this might be transcription or direct text)
                 if hasattr(part, 'text') and part.text:
@@ -376,10 +865,7 @@ class SessionManager:
                             sys.stderr.write(f"[TTFB] Total latency: {total_latency:.3f}s\n")
                             sys.stderr.flush()
 
-                            await self.websocket.send_text(json.dumps({
-                                "type": "ttfb",
-                                "duration": total_latency
-                            }))
+                            await self.send_ttfb(total_latency)
                             self.ttfb_recorded = True
                             self.has_new_user_input = False
                             self.response_in_progress = True
@@ -412,6 +898,11 @@ class SessionManager:
         elif hasattr(fc, 'parameters') and fc.parameters:
             args = dict(fc.parameters) if not isinstance(fc.parameters, dict) else fc.parameters
 
+        self.tool_args[getattr(fc, "id", None) or tool_name] = args
+
+        if tool_name in config.TOOL_ACK_SNIPPETS:
+            await self.play_ack(config.TOOL_ACK_SNIPPETS[tool_name])
+
         # Track start time for this specific tool
         current_time = time.time()
         self.current_tool_start_times[tool_name] = current_time
@@ -455,6 +946,7 @@ class SessionManager:
                 args = fc.args
             elif hasattr(fc, 'parameters'):
                 args = fc.parameters
+            self.tool_args[getattr(fc, "id", None) or tool_name] = dict(args or {})
 
             # Track start time for this specific tool
             current_time = time.time()
@@ -466,6 +958,9 @@ class SessionManager:
                 sys.stderr.write(f"[TOOL] First tool execution started at {self.first_tool_start_time}\n")
                 sys.stderr.flush()
 
+            if tool_name in config.TOOL_ACK_SNIPPETS:
+                await self.play_ack(config.TOOL_ACK_SNIPPETS[tool_name])
+
             # Send subagent start event to frontend
             await self.websocket.send_text(json.dumps({
                 "type": "subagent_start",
@@ -503,6 +998,8 @@ class SessionManager:
             # Track the last tool end time
             self.last_tool_end_time = current_time
 
+            self.remember_trip(tool_name, result, getattr(fr, "id", None))
+
             # Check if all tools have completed
             if not self.current_tool_start_times:  # No more tools running
                 self.waiting_for_tools = False
@@ -524,16 +1021,13 @@ class SessionManager:
                     sys.stderr.write(f"[TTFB] Total latency: {total_latency:.3f}s (Tool time: {tool_execution_time:.3f}s)\n")
                     sys.stderr.flush()
 
-                    await self.websocket.send_text(json.dumps({
-                        "type": "ttfb",
-                        "duration": total_latency
-                    }))
+                    await self.send_ttfb(total_latency)
                     self.ttfb_recorded = True
                     self.has_new_user_input = False
 
-            # Format result for display
+            # Results are already shaped for the model - send them compactly
             if isinstance(result, dict):
-                result_str = json.dumps(result, indent=2)
+                result_str = json.dumps(result, separators=(",", ":"))
             else:
                 result_str = str(result)
 
@@ -548,7 +1042,7 @@ class SessionManager:
             print(f"Subagent {subagent_name} completed in {duration:.2f}s")
 
             # Special handling for flight data - check if result contains flight information
-            if tool_name in ["consult_flight_specialist", "check_flight_availability_subagent"]:
+            if tool_name in ["consult_flight_specialist", "stream_flight_specialist", "check_flight_availability_subagent"]:
                 # Parse result for flight data if it's a string response
                 if isinstance(result, str) and any(keyword in result.lower() for keyword in ["flight", "price", "airline"]):
                     # Extract flight details from the response (if structured)
@@ -612,10 +1106,7 @@ class SessionManager:
                         sys.stderr.write(f"[TTFB] Total latency: {total_latency:.3f}s (Tool time: {tool_execution_time:.3f}s)\n")
                         sys.stderr.flush()
 
-                        await self.websocket.send_text(json.dumps({
-                            "type": "ttfb",
-                            "duration": total_latency
-                        }))
+                        await self.send_ttfb(total_latency)
                         self.ttfb_recorded = True
                         self.has_new_user_input = False
 
@@ -0,0 +1,88 @@
+"""
+Local stub of the GenAI generateContent endpoint, for exercising the shared client pool offline.
+
+Usage:
+    python stub_genai_server.py [--port 8089]            # serve until interrupted
+    python stub_genai_server.py --selftest [--calls 20]  # run pooled calls against it and print reuse metrics
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+STUB_RESPONSE = {
+    "candidates": [{
+        "content": {"role": "model", "parts": [{"text": "Stub response."}]},
+        "finishReason": "STOP",
+        "index": 0,
+    }],
+    "usageMetadata": {"promptTokenCount": 4, "candidatesTokenCount": 2, "totalTokenCount": 6},
+}
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # Keep-alive, so clients can reuse connections
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        body = json.dumps(STUB_RESPONSE).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve(port: int) -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer(("127.0.0.1", port), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def selftest(port: int, calls: int):
+    # Point the shared registry at the stub before it's imported
+    os.environ["GENAI_BASE_URL"] = f"http://127.0.0.1:{port}"
+    os.environ["GOOGLE_GENAI_USE_VERTEXAI"] = "false"
+    os.environ.setdefault("GOOGLE_API_KEY", "stub")
+    from client_pool import connection_metrics, get_client
+    import config
+
+    server = serve(port)
+    client = get_client("selftest")
+
+    async def _calls():
+        for _ in range(calls):
+            await client.aio.models.generate_content(model=config.SUBAGENT_MODEL, contents="ping")
+
+    asyncio.run(_calls())
+    server.shutdown()
+    print(json.dumps(connection_metrics(), indent=2))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local GenAI stub server.")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--selftest", action="store_true", help="Run pooled calls against the stub and print metrics")
+    parser.add_argument("--calls", type=int, default=20)
+    args = parser.parse_args()
+
+    if args.selftest:
+        selftest(args.port, args.calls)
+        return
+
+    server = serve(args.port)
+    print(f"Stub GenAI server on http://127.0.0.1:{args.port} (set GENAI_BASE_URL to use it)")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
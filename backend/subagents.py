@@ -1,5 +1,5 @@
-from google.adk.agents import LlmAgent
-from google.adk.tools import google_search
+from functools import lru_cache
+from rate_limiter import acquire, report_result
 import config
 
 # Flight tools - mock flight database
@@ -64,18 +64,55 @@ def check_flight_availability(destination: str, date: str) -> dict:
 
     return result
 
-# Create Flight Specialist Subagent
-flight_specialist = LlmAgent(
-    name="flight_specialist",
-    model=config.SUBAGENT_MODEL,
-    instruction=config.FLIGHT_SPECIALIST_INSTRUCTION,
-    tools=[check_flight_availability]
-)
+# Rate limiting for subagent model calls (runs on the subagent loop, before/after each model request)
+async def _acquire_model_call(callback_context, llm_request):
+    await acquire(f"model:{config.SUBAGENT_MODEL}")
+    return None
 
-# Create Lifestyle Specialist Subagent
-lifestyle_specialist = LlmAgent(
-    name="lifestyle_specialist",
-    model=config.SUBAGENT_MODEL,
-    instruction=config.LIFESTYLE_SPECIALIST_INSTRUCTION,
-    tools=[google_search]  # Using native Google search tool
-)
\ No newline at end of file
+
+def _model_call_succeeded(callback_context, llm_response):
+    report_result(None, f"model:{config.SUBAGENT_MODEL}")
+    return None
+
+
+# Subagents are built on first use so importing this module stays cheap (see warmup.py)
+@lru_cache(maxsize=None)
+def get_flight_specialist():
+    """Creates the Flight Specialist subagent."""
+    from google.adk.agents import LlmAgent
+    from client_pool import get_model
+
+    return LlmAgent(
+        name="flight_specialist",
+        model=get_model(config.SUBAGENT_MODEL, pool="subagents"),
+        instruction=config.FLIGHT_SPECIALIST_INSTRUCTION,
+        tools=[check_flight_availability],
+        before_model_callback=_acquire_model_call,
+        after_model_callback=_model_call_succeeded
+    )
+
+
+@lru_cache(maxsize=None)
+def get_lifestyle_specialist():
+    """Creates the Lifestyle Specialist subagent."""
+    from google.adk.agents import LlmAgent
+    from client_pool import get_model
+    from google.adk.tools import google_search
+
+    return LlmAgent(
+        name="lifestyle_specialist",
+        model=get_model(config.SUBAGENT_MODEL, pool="subagents"),
+        instruction=config.LIFESTYLE_SPECIALIST_INSTRUCTION,
+        tools=[google_search],  # Using native Google search tool
+        before_model_callback=_acquire_model_call,
+        after_model_callback=_model_call_succeeded
+    )
+
+
+def __getattr__(name):
+    # Backwards compatible module attributes (flight_specialist, lifestyle_specialist)
+    if name == "flight_specialist":
+        return get_flight_specialist()
+    if name == "lifestyle_specialist":
+        return get_lifestyle_specialist()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
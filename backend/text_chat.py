@@ -0,0 +1,127 @@
+"""
+Text-only chat over Server-Sent Events.
+Runs the Nomad tools with a text model through one pooled runner, so chat widgets and batch jobs
+don't occupy Live audio sessions.
+"""
+
+import asyncio
+import json
+import time
+from typing import AsyncGenerator, Optional
+from google.genai import types
+from google.adk.runners import InMemoryRunner
+from google.adk.agents.run_config import RunConfig, StreamingMode
+from agents import get_text_agent
+from logger import log_sink
+from rate_limiter import RateLimitExceeded, acquire, current_session, report_result
+import config
+
+APP_NAME = f"{config.APP_NAME}_text"
+
+_runner = None
+_last_used = {}  # (user_id, session_id) -> last request time
+
+
+def get_text_runner() -> InMemoryRunner:
+    """Process-wide runner shared by all text requests (conversations are separate sessions)."""
+    global _runner
+    if _runner is None:
+        _runner = InMemoryRunner(app_name=APP_NAME, agent=get_text_agent())
+    return _runner
+
+
+async def _expire_sessions(runner: InMemoryRunner):
+    now = time.time()
+    for (user_id, session_id), used in list(_last_used.items()):
+        if now - used > config.TEXT_SESSION_TTL_SECONDS:
+            _last_used.pop((user_id, session_id), None)
+            await runner.session_service.delete_session(app_name=APP_NAME, user_id=user_id, session_id=session_id)
+
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, separators=(',', ':'), default=str)}\n\n"
+
+
+async def _run_agent(runner: InMemoryRunner, user_id: str, session_id: str, message: str, out: asyncio.Queue):
+    """Runs one text turn, pushing text deltas, tool calls and the final answer onto out."""
+    run_config = RunConfig(response_modalities=["TEXT"], streaming_mode=StreamingMode.SSE)
+    streamed = False
+    try:
+        async for event in runner.run_async(
+            user_id=user_id,
+            session_id=session_id,
+            new_message=types.Content(role="user", parts=[types.Part(text=message)]),
+            run_config=run_config
+        ):
+            for fc in event.get_function_calls():
+                out.put_nowait({"type": "tool_call", "name": fc.name, "args": dict(fc.args or {})})
+
+            if not (event.content and event.content.parts) or event.author == "user":
+                continue
+            text = "".join(part.text for part in event.content.parts if part.text and not part.thought)
+            if not text:
+                continue
+            if event.partial:
+                streamed = True
+                out.put_nowait({"type": "text", "text": text})
+            elif not streamed:
+                # Non-streamed turn: the final event carries the whole text
+                out.put_nowait({"type": "text", "text": text})
+            else:
+                streamed = False  # Aggregated copy of what was already streamed; next model turn starts fresh
+        report_result(None, f"model:{config.TEXT_MODEL}")
+    except Exception as e:
+        print(f"ERROR: Text chat run failed: {e}")
+        report_result(e, f"model:{config.TEXT_MODEL}")
+        out.put_nowait({"type": "error", "message": "Sorry, something went wrong. Please try again."})
+    finally:
+        out.put_nowait(None)
+
+
+async def stream_text_chat(message: str, session_id: Optional[str] = None,
+                           user_id: str = "text_user") -> AsyncGenerator[str, None]:
+    """
+    Streams one text turn as SSE: a session event, then text deltas, tool events (subagent_start /
+    subagent_progress / subagent_complete / tool_call) and a final done event.
+    Pass the returned session_id back to continue the conversation.
+    """
+    runner = get_text_runner()
+    await _expire_sessions(runner)
+
+    try:
+        await acquire(f"model:{config.TEXT_MODEL}", session=user_id, max_wait=config.TEXT_REQUEST_MAX_WAIT_SECONDS)
+    except RateLimitExceeded:
+        yield _sse("error", {"message": "Nomad is very busy right now. Please try again in a moment."})
+        return
+
+    session = None
+    if session_id:
+        session = await runner.session_service.get_session(app_name=APP_NAME, user_id=user_id, session_id=session_id)
+    if session is None:
+        session = await runner.session_service.create_session(app_name=APP_NAME, user_id=user_id)
+    _last_used[(user_id, session.id)] = time.time()
+    yield _sse("session", {"session_id": session.id})
+
+    # Tool logs for this request go to the stream instead of the Live sessions' global queue
+    out = asyncio.Queue()
+    log_sink.set(out)
+    current_session.set(session.id)
+    start_time = time.time()
+    task = asyncio.create_task(_run_agent(runner, user_id, session.id, message, out))
+    try:
+        while True:
+            try:
+                item = await asyncio.wait_for(out.get(), timeout=config.SSE_HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+                continue
+            if item is None:
+                break
+            yield _sse(item.get("type", "message"), item)
+
+        yield _sse("done", {"session_id": session.id, "duration": time.time() - start_time})
+    finally:
+        # Client disconnected mid-stream (or we're done): don't leave the run going
+        if not task.done():
+            task.cancel()
+        _last_used[(user_id, session.id)] = time.time()
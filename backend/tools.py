@@ -5,25 +5,89 @@ The Live API requires tools, so we create tools that internally delegate to suba
 
 import time
 import asyncio
-from typing import Dict, Any, Optional
+import concurrent.futures
+import contextvars
+import inspect
+import json
+import threading
+from typing import Dict, Any, List, Optional, Tuple, Callable, AsyncGenerator
 from concurrent.futures import ThreadPoolExecutor
 from google.adk.runners import InMemoryRunner
-from subagents import flight_specialist, lifestyle_specialist
-from logger import log_tool_start, log_tool_complete
+from subagents import get_flight_specialist, get_lifestyle_specialist
+from logger import log_tool_start, log_tool_complete, log_subagent_progress
+from result_shaping import FlightRecord, MODEL_FLIGHT_FIELDS, collect_flights, flight_record, shape_for_model, ui_payload
+from intent_router import flight_key, lifestyle_key
+from rate_limiter import RateLimitExceeded, acquire, current_session, is_quota_error, report_result
+import config
 
 from google.genai import types
 
-def _run_subagent_sync(agent, query: str, app_name: str) -> str:
+# Subagents run on one long-lived event loop: pooled HTTP connections are bound to the loop that opened
+# them, so a fresh asyncio.run() per call would throw every connection away.
+_subagent_loop = None
+_runners = {}  # (agent name, app_name) -> InMemoryRunner, shared across calls
+_pool_lock = threading.Lock()
+
+
+# In-flight subagent runs per session: session key -> {future: reusable}. Barge-in cancels the
+# non-reusable ones; pre-dispatched runs are left to finish since the next turn may claim them.
+# Pre-dispatched runs are marked with their prefetch token (truthy) so they can be cancelled individually.
+_inflight = {}
+_inflight_lock = threading.Lock()
+reusable_work = contextvars.ContextVar("reusable_work", default=False)
+
+
+class SubagentCancelled(Exception):
+    """Raised when an in-flight subagent run is cancelled (e.g. the user barged in)."""
+
+
+def cancel_session_work(session_key: str) -> int:
+    """Cancels a session's in-flight, non-reusable subagent runs. Returns how many were cancelled."""
+    with _inflight_lock:
+        futures = [f for f, reusable in _inflight.get(session_key, {}).items() if not reusable]
+    return sum(1 for future in futures if future.cancel())
+
+
+def _cancel_inflight_token(session_key: str, token) -> int:
+    """Cancels the subagent runs started under one prefetch token."""
+    with _inflight_lock:
+        futures = [f for f, reusable in _inflight.get(session_key, {}).items() if reusable is token]
+    return sum(1 for future in futures if future.cancel())
+
+
+def _get_subagent_loop() -> asyncio.AbstractEventLoop:
+    global _subagent_loop
+    with _pool_lock:
+        if _subagent_loop is None:
+            _subagent_loop = asyncio.new_event_loop()
+            threading.Thread(target=_subagent_loop.run_forever, name="subagent-loop", daemon=True).start()
+        return _subagent_loop
+
+
+def _get_runner(agent, app_name: str) -> InMemoryRunner:
+    """Returns the pooled runner for an agent (each call still gets its own session)."""
+    with _pool_lock:
+        key = (agent.name, app_name)
+        if key not in _runners:
+            _runners[key] = InMemoryRunner(app_name=app_name, agent=agent)
+        return _runners[key]
+
+
+def _run_subagent_sync(agent, query: str, app_name: str, tool_results: Optional[list] = None,
+                       on_progress: Optional[Callable[[dict], None]] = None) -> str:
     """
-    Runs a subagent synchronously in a separate thread.
-    This is necessary because asyncio.run() cannot be called from a running event loop.
+    Runs a subagent synchronously from a worker thread.
+    The run itself is scheduled on the shared subagent loop (we can't block the caller's running loop).
+    If tool_results is given, raw (tool_name, result) pairs from the subagent's tool calls are appended to it.
+    If on_progress is given, it is called (from the worker thread) with each tool result and text chunk as they arrive.
     """
     try:
-        # Create a fresh runner for this execution
-        # We use app_name="agents" to match the LlmAgent origin and avoid warnings,
-        # or we can accept the mismatch. The user requested a robust fix, so let's try to be clean.
-        # However, if we use "agents" for all, we rely on unique session IDs (which create_session handles).
-        runner = InMemoryRunner(app_name=app_name, agent=agent)
+        # Reuse the pooled runner for this agent
+        # We use app_name="agents" to match the LlmAgent origin and avoid warnings.
+        # Calls are isolated by unique session IDs (which create_session handles).
+        runner = _get_runner(agent, app_name)
+        # Carry the calling session over to the subagent loop (for fair model-call queuing)
+        session_key = current_session.get()
         
         # Build tool map
         tool_map = {}
@@ -39,12 +103,23 @@ def _run_subagent_sync(agent, query: str, app_name: str) -> str:
                      tool_map[tool.name] = tool
 
         async def _run():
+            current_session.set(session_key)
             # Create session
             session = await runner.session_service.create_session(
                 app_name=app_name,
                 user_id="user_123"
             )
-            
+            try:
+                return await _run_turns(session)
+            finally:
+                # Evict the one-off subagent session so its history doesn't outlive the call
+                await runner.session_service.delete_session(
+                    app_name=app_name,
+                    user_id="user_123",
+                    session_id=session.id
+                )
+
+        async def _run_turns(session):
             # Initial message
             current_message = types.Content(
                 role="user",
@@ -68,6 +143,8 @@ def _run_subagent_sync(agent, query: str, app_name: str) -> str:
                         for part in event.content.parts:
                             if part.text:
                                 final_response_text += part.text
+                                if on_progress:
+                                    on_progress({"stage": "text", "text": part.text})
                     
                     # Handle Tool Calls
                     function_calls = event.get_function_calls()
@@ -81,8 +158,16 @@ def _run_subagent_sync(agent, query: str, app_name: str) -> str:
                             if tool_name in tool_map:
                                 try:
                                     # Execute tool
+                                    # Off the shared subagent loop, so a slow tool doesn't stall other sessions
                                     func = tool_map[tool_name]
-                                    result = func(**tool_args)
+                                    if inspect.iscoroutinefunction(func):
+                                        result = await func(**tool_args)
+                                    else:
+                                        result = await asyncio.to_thread(func, **tool_args)
+                                    if tool_results is not None:
+                                        tool_results.append((tool_name, result))
+                                    if on_progress:
+                                        on_progress({"stage": "tool_result", "tool": tool_name, "result": result})
                                     
                                     # Create response part
                                     tool_responses.append(types.Part(
@@ -129,58 +214,363 @@ def _run_subagent_sync(agent, query: str, app_name: str) -> str:
 
             return final_response_text if final_response_text else "No information available."
 
-        return asyncio.run(_run())
+        future = asyncio.run_coroutine_threadsafe(_run(), _get_subagent_loop())
+        with _inflight_lock:
+            _inflight.setdefault(session_key, {})[future] = reusable_work.get()
+        try:
+            return future.result()
+        except concurrent.futures.CancelledError:
+            raise SubagentCancelled(f"{agent.name} run cancelled")
+        finally:
+            with _inflight_lock:
+                runs = _inflight.get(session_key, {})
+                runs.pop(future, None)
+                if not runs:
+                    _inflight.pop(session_key, None)
+    except SubagentCancelled:
+        raise
     except Exception as e:
         print(f"Error in subagent execution ({app_name}): {e}")
         raise e
 
-async def consult_flight_specialist(destination: str, date: str) -> str:
+def _progress_reporter(agent_label: str, loop, sink: Optional[asyncio.Queue] = None) -> Callable[[dict], None]:
     """
-    Consults the Flight Specialist subagent for flight information.
-    This is a wrapper tool for the Live API to delegate to the Flight Specialist subagent.
+    Builds an on_progress callback for _run_subagent_sync.
+    Updates are shaped for display (flight results become flight records), pushed to the frontend as
+    subagent_progress events and, if sink is given, forwarded to it. Safe to call from the worker thread.
+    """
+    def report(progress: dict):
+        if progress.get("stage") == "tool_result":
+            result = progress.get("result")
+            if isinstance(result, dict) and result.get("flight"):
+                progress = {"stage": "flight", "flight": flight_record(result)}
+            else:
+                progress = {"stage": "tool_result", "tool": progress.get("tool"), "result": str(result)}
 
-    Args:
-        destination: The destination city or airport.
-        date: The travel date (can be descriptive like "May" or specific like "2024-05-20").
+        log_subagent_progress(agent_label, progress, loop=loop)
+        if sink is not None:
+            loop.call_soon_threadsafe(sink.put_nowait, progress)
+
+    return report
 
-    Returns:
-        The Flight Specialist's response with flight information.
-    """
-    start_time = time.time()
-    log_tool_start("Flight Specialist", {"destination": destination, "date": date})
 
+async def _run_flight_specialist(destination: str, date: str, progress_sink: Optional[asyncio.Queue] = None,
+                                 report_progress: bool = True) -> Tuple[str, List[FlightRecord]]:
+    """
+    Runs the Flight Specialist and returns (summary, flight records). Failures become the summary text.
+    Without report_progress no partial results are sent (fan-out runs would interleave them in the UI).
+    """
+    on_progress = (_progress_reporter("Flight Specialist", asyncio.get_running_loop(), progress_sink)
+                   if report_progress else None)
+    tool_results = []
     try:
+        await acquire("tool:flight_specialist")
         query = f"Find flights to {destination} for {date}"
         # Use asyncio.to_thread to run the sync subagent loop without blocking the main loop
-        result = await asyncio.to_thread(_run_subagent_sync, flight_specialist, query, "agents")
+        summary = await asyncio.to_thread(
+            _run_subagent_sync, get_flight_specialist(), query, "agents", tool_results, on_progress
+        )
+        report_result(None, "tool:flight_specialist")
+    except SubagentCancelled:
+        summary = "Cancelled: the user interrupted before the flight search finished."
+    except RateLimitExceeded as e:
+        print(f"Flight Specialist rate limited: {e}")
+        summary = config.SPECIALIST_BUSY_MESSAGE.format(specialist="flight specialist")
     except Exception as e:
         print(f"Error consulting Flight Specialist: {e}")
-        result = f"I couldn't get flight information for {destination} on {date} at the moment. Error: {str(e)}"
+        report_result(e, "tool:flight_specialist", f"model:{config.SUBAGENT_MODEL}")
+        if is_quota_error(e):
+            summary = config.SPECIALIST_BUSY_MESSAGE.format(specialist="flight specialist")
+        else:
+            summary = f"I couldn't get flight information for {destination} on {date} at the moment. Error: {str(e)}"
+
+    return summary, collect_flights(tool_results)
+
+
+async def _run_lifestyle_specialist(query: str, progress_sink: Optional[asyncio.Queue] = None,
+                                    report_progress: bool = True) -> str:
+    """Runs the Lifestyle Specialist and returns its answer. Failures become the answer text."""
+    on_progress = (_progress_reporter("Lifestyle Specialist", asyncio.get_running_loop(), progress_sink)
+                   if report_progress else None)
+    try:
+        await acquire("tool:lifestyle_specialist")
+        # Use asyncio.to_thread to run the sync subagent loop without blocking the main loop
+        summary = await asyncio.to_thread(
+            _run_subagent_sync, get_lifestyle_specialist(), query, "agents", None, on_progress
+        )
+        report_result(None, "tool:lifestyle_specialist")
+        return summary
+    except SubagentCancelled:
+        return "Cancelled: the user interrupted before the search finished."
+    except RateLimitExceeded as e:
+        print(f"Lifestyle Specialist rate limited: {e}")
+        return config.SPECIALIST_BUSY_MESSAGE.format(specialist="lifestyle specialist")
+    except Exception as e:
+        print(f"Error consulting Lifestyle Specialist: {e}")
+        report_result(e, "tool:lifestyle_specialist", f"model:{config.SUBAGENT_MODEL}")
+        if is_quota_error(e):
+            return config.SPECIALIST_BUSY_MESSAGE.format(specialist="lifestyle specialist")
+        return f"Error: {str(e)}"
+
+
+# Specialist runs started early by the intent router: (session key, query key) -> (task, started_at, token).
+# The same session's next matching tool call claims the task instead of starting its own run.
+_prefetched = {}
+
+
+def _cancel_prefetch(entry_key, entry):
+    task, _, token = entry
+    task.cancel()
+    _cancel_inflight_token(entry_key[0], token)  # The run itself lives on the subagent loop
+
+
+def _expire_prefetched():
+    """Drops unclaimed prefetches past PREFETCH_TTL_SECONDS, cancelling their subagent runs."""
+    now = time.time()
+    for key in [k for k, (_, started, _) in _prefetched.items() if now - started > config.PREFETCH_TTL_SECONDS]:
+        _cancel_prefetch(key, _prefetched.pop(key))
+
+
+def cancel_prefetches(session_key: str) -> int:
+    """Cancels every unclaimed prefetch of a session (e.g. when it closes). Returns how many were dropped."""
+    keys = [k for k in _prefetched if k[0] == session_key]
+    for key in keys:
+        _cancel_prefetch(key, _prefetched.pop(key))
+    return len(keys)
+
+
+async def _as_reusable(coro, token):
+    # Marks the run as reusable so barge-in doesn't cancel it (the next turn may claim it)
+    reusable_work.set(token)
+    return await coro
+
+
+def _prefetch(key, coro) -> bool:
+    _expire_prefetched()
+    entry_key = (current_session.get(), key)
+    if key is None or entry_key in _prefetched:
+        coro.close()
+        return False
+    token = object()
+    _prefetched[entry_key] = (asyncio.ensure_future(_as_reusable(coro, token)), time.time(), token)
+    return True
+
+
+def _claim_prefetched(key) -> Optional[asyncio.Future]:
+    _expire_prefetched()
+    entry = _prefetched.pop((current_session.get(), key), None) if key is not None else None
+    return entry[0] if entry else None
+
+
+def prefetch_flights(destination: str, date: str) -> bool:
+    """Starts a Flight Specialist run ahead of the orchestrator's tool call. Returns False if already running."""
+    return _prefetch(flight_key(destination, date), _run_flight_specialist(destination, date))
+
+
+def prefetch_lifestyle(query: str) -> bool:
+    """Starts a Lifestyle Specialist run ahead of the orchestrator's tool call. Returns False if not keyable or already running."""
+    return _prefetch(lifestyle_key(query), _run_lifestyle_specialist(query))
+
+
+async def _consult_flights(destination: str, date: str, progress_sink: Optional[asyncio.Queue] = None) -> dict:
+    start_time = time.time()
+    log_tool_start("Flight Specialist", {"destination": destination, "date": date})
+
+    prefetched = _claim_prefetched(flight_key(destination, date))
+    if prefetched is not None:
+        print(f"Using pre-dispatched Flight Specialist result for {destination} / {date}")
+        summary, flights = await prefetched
+    else:
+        summary, flights = await _run_flight_specialist(destination, date, progress_sink)
+
+    result = shape_for_model(summary, flights)
 
     duration = time.time() - start_time
-    log_tool_complete("Flight Specialist", result, duration)
+    log_tool_complete("Flight Specialist", summary, duration, ui=ui_payload("Flight Specialist", summary, flights))
+
+    return result
+
+
+async def _consult_lifestyle(query: str, progress_sink: Optional[asyncio.Queue] = None) -> dict:
+    start_time = time.time()
+    log_tool_start("Lifestyle Specialist", {"query": query})
+
+    prefetched = _claim_prefetched(lifestyle_key(query))
+    if prefetched is not None:
+        print(f"Using pre-dispatched Lifestyle Specialist result for: {query}")
+        summary = await prefetched
+    else:
+        summary = await _run_lifestyle_specialist(query, progress_sink)
+
+    result = shape_for_model(summary)
+
+    duration = time.time() - start_time
+    log_tool_complete("Lifestyle Specialist", summary, duration, ui=ui_payload("Lifestyle Specialist", summary))
 
     return result
 
 
-async def consult_lifestyle_specialist(query: str) -> str:
+async def _stream_progress(consult_coro, updates: asyncio.Queue, stages: tuple) -> AsyncGenerator[str, None]:
+    """
+    Runs a consult coroutine and yields compact JSON for each progress update whose stage is in stages,
+    followed by the final shaped result.
+    """
+    task = asyncio.ensure_future(consult_coro)
+    try:
+        while not task.done():
+            getter = asyncio.ensure_future(updates.get())
+            done, _ = await asyncio.wait({task, getter}, return_when=asyncio.FIRST_COMPLETED)
+            if getter not in done:
+                getter.cancel()
+                break
+            progress = getter.result()
+            if progress.get("stage") in stages:
+                yield json.dumps({"partial": True, **progress}, separators=(",", ":"), default=str)
+
+        # Updates queued just before completion
+        while not updates.empty():
+            progress = updates.get_nowait()
+            if progress.get("stage") in stages:
+                yield json.dumps({"partial": True, **progress}, separators=(",", ":"), default=str)
+
+        yield json.dumps({"partial": False, **(await task)}, separators=(",", ":"))
+    finally:
+        if not task.done():
+            task.cancel()
+
+
+async def consult_flight_specialist(destination: str, date: str) -> dict:
+    """
+    Consults the Flight Specialist subagent for flight information.
+    This is a wrapper tool for the Live API to delegate to the Flight Specialist subagent.
+
+    Args:
+        destination: The destination city or airport.
+        date: The travel date (can be descriptive like "May" or specific like "2024-05-20").
+
+    Returns:
+        A compact summary of the Flight Specialist's answer and the cheapest matching flights.
+    """
+    return await _consult_flights(destination, date)
+
+
+async def consult_lifestyle_specialist(query: str) -> dict:
     """
     Consults the Lifestyle Specialist for destination/weather info.
     """
+    return await _consult_lifestyle(query)
+
+
+async def stream_flight_specialist(destination: str, date: str) -> AsyncGenerator[str, None]:
+    """
+    Streaming variant of consult_flight_specialist.
+    Yields each flight as soon as the Flight Specialist finds it, then the final summary.
+
+    Args:
+        destination: The destination city or airport.
+        date: The travel date (can be descriptive like "May" or specific like "2024-05-20").
+    """
+    updates = asyncio.Queue()
+    async for update in _stream_progress(_consult_flights(destination, date, updates), updates, ("flight",)):
+        yield update
+
+
+async def stream_lifestyle_specialist(query: str) -> AsyncGenerator[str, None]:
+    """
+    Streaming variant of consult_lifestyle_specialist.
+    Yields each Lifestyle Specialist turn as it completes, then the final summary.
+    """
+    updates = asyncio.Queue()
+    async for update in _stream_progress(_consult_lifestyle(query, updates), updates, ("text",)):
+        yield update
+
+
+def _normalize_query(text: str) -> str:
+    return " ".join(str(text).lower().split())
+
+
+async def compare_travel_options(destinations: List[str], dates: List[str],
+                                 topics: Optional[List[str]] = None) -> dict:
+    """
+    Consults the specialists for many queries at once and returns a merged, ranked comparison.
+    Use this instead of repeated consult_flight_specialist/consult_lifestyle_specialist calls when the user
+    asks about several destinations, dates or topics in one request.
+
+    Args:
+        destinations: Destination cities or airports to compare (e.g. ["Tokyo", "Osaka", "Seoul"]).
+        dates: Travel dates to check for every destination (e.g. ["May", "June"]).
+        topics: Optional destination/weather/events questions for the Lifestyle Specialist
+            (e.g. ["weather in Tokyo in May"]).
+
+    Returns:
+        Flight options ranked by price, a short answer per topic, and how many queries were run.
+    """
     start_time = time.time()
-    log_tool_start("Lifestyle Specialist", {"query": query})
+    log_tool_start("Specialist Team", {"destinations": destinations, "dates": dates, "topics": topics or []})
 
-    try:
-        # Use asyncio.to_thread to run the sync subagent loop without blocking the main loop
-        result = await asyncio.to_thread(_run_subagent_sync, lifestyle_specialist, query, "agents")
-    except Exception as e:
-        print(f"Error consulting Lifestyle Specialist: {e}")
-        result = f"Error: {str(e)}"
+    # Deduplicate repeated sub-queries (case/whitespace-insensitive), keeping the first spelling
+    flight_queries = {}
+    for destination in destinations or []:
+        for date in dates or []:
+            flight_queries.setdefault((_normalize_query(destination), _normalize_query(date)), (destination, date))
+    topic_queries = {}
+    for topic in topics or []:
+        topic_queries.setdefault(_normalize_query(topic), topic)
+
+    requested = len(destinations or []) * len(dates or []) + len(topics or [])
+    planned = list(flight_queries.values())[:config.FANOUT_MAX_QUERIES]
+    planned_topics = list(topic_queries.values())[:max(0, config.FANOUT_MAX_QUERIES - len(planned))]
+    skipped = requested - len(flight_queries) - len(topic_queries)
+    dropped = len(flight_queries) + len(topic_queries) - len(planned) - len(planned_topics)
+
+    semaphore = asyncio.Semaphore(config.FANOUT_MAX_CONCURRENCY)
+
+    async def _bounded(coro):
+        async with semaphore:
+            return await coro
+
+    # One fan-out for flights and topics, so total latency is the slowest query rather than flights + topics.
+    # Per-run progress is off: every run would update the same specialist card with a different destination.
+    results = await asyncio.gather(
+        *(_bounded(_run_flight_specialist(destination, date, report_progress=False)) for destination, date in planned),
+        *(_bounded(_run_lifestyle_specialist(topic, report_progress=False)) for topic in planned_topics)
+    )
+    flight_results, topic_results = results[:len(planned)], results[len(planned):]
+
+    # Rank every flight found across all (destination, date) pairs by price
+    options = []
+    for (destination, date), (_, flights) in zip(planned, flight_results):
+        for flight in flights:
+            options.append({"destination": destination, "date": date, **flight})
+    options.sort(key=lambda o: (o.get("price") is None, o.get("price") or 0, o["destination"], o["date"]))
+    for rank, option in enumerate(options, start=1):
+        option["rank"] = rank
+
+    # Split the byte budget across topic answers
+    topic_budget = config.FANOUT_RESULT_MAX_BYTES // (2 * max(1, len(planned_topics)))
+    answers = [
+        {"topic": topic, "summary": shape_for_model(summary, max_bytes=topic_budget)["summary"]}
+        for topic, summary in zip(planned_topics, topic_results)
+    ]
+
+    merged = {
+        "ranked_flights": [
+            {field: option[field] for field in ("rank", "destination", "date") + MODEL_FLIGHT_FIELDS if field in option}
+            for option in options[:config.FANOUT_MAX_RANKED_FLIGHTS]
+        ],
+        "topics": answers,
+        "queries_run": len(planned) + len(planned_topics),
+        "duplicates_skipped": skipped,
+        "truncated": dropped > 0 or len(options) > config.FANOUT_MAX_RANKED_FLIGHTS,
+    }
 
     duration = time.time() - start_time
-    log_tool_complete("Lifestyle Specialist", result, duration)
+    ui = {"agent": "Specialist Team", "flights": options, "topics": [
+        {"topic": topic, "summary": summary} for topic, summary in zip(planned_topics, topic_results)
+    ]}
+    log_tool_complete("Specialist Team", json.dumps(merged, separators=(",", ":")), duration, ui=ui)
 
-    return result
+    return merged
 
 
 # Alternative synchronous implementation using mock data if ADK runners fail
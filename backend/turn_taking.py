@@ -0,0 +1,149 @@
+"""
+Adaptive turn-taking.
+Measures a speaker's pauses and false endpoints (the server ended their turn while they were still talking)
+from input transcription timing, and tunes the Live API's automatic activity detection within bounds.
+"""
+
+import math
+import time
+from typing import List, Optional
+from google.genai import types
+import config
+
+# Final transcripts ending in these words were most likely cut off mid-sentence
+CONTINUATION_WORDS = {
+    "and", "but", "or", "so", "to", "from", "with", "the", "a", "an", "for", "in", "on", "of", "at",
+    "um", "uh", "er", "like", "because", "then", "maybe", "around",
+}
+
+MAX_PAUSE_SAMPLES = 200
+
+
+def _percentile(values: List[float], pct: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, math.ceil(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def _clamp(value: float, low: float, high: float) -> float:
+    return max(low, min(high, value))
+
+
+class EndpointTracker:
+    """Per-session pause and false-endpoint statistics plus the silence duration they recommend."""
+
+    def __init__(self, silence_duration_ms: int, prefix_padding_ms: int = 300,
+                 start_sensitivity: str = "START_SENSITIVITY_LOW",
+                 end_sensitivity: str = "END_SENSITIVITY_LOW",
+                 baseline_silence_ms: Optional[int] = None):
+        # What the client asked for is used as is; the VAD_SILENCE_* bounds only apply to learned values
+        self.silence_duration_ms = int(silence_duration_ms)
+        self.prefix_padding_ms = prefix_padding_ms
+        self.start_sensitivity = start_sensitivity
+        self.end_sensitivity = end_sensitivity
+        self.baseline_silence_ms = baseline_silence_ms or silence_duration_ms  # What the client asked for
+
+        self.pauses_ms: List[float] = []
+        self.turns = 0
+        self.false_endpoints = 0
+
+        self.in_user_turn = False
+        self.last_chunk_time = None
+        self.response_started_at = None
+        self.turn_flagged = False  # The current turn was already counted as a false endpoint
+
+    def apply_learned(self, settings: dict):
+        """Starts from settings learned in an earlier session (recommend()), kept within the VAD_SILENCE_* bounds."""
+        self.silence_duration_ms = int(_clamp(settings["silence_duration_ms"],
+                                              config.VAD_SILENCE_MIN_MS, config.VAD_SILENCE_MAX_MS))
+        self.end_sensitivity = settings["end_of_speech_sensitivity"]
+
+    def on_user_chunk(self, now: Optional[float] = None):
+        """An input transcription chunk arrived."""
+        now = now or time.time()
+        if self.in_user_turn:
+            gap_ms = (now - self.last_chunk_time) * 1000
+            if gap_ms >= config.VAD_MIN_PAUSE_MS:
+                self.pauses_ms.append(gap_ms)
+                del self.pauses_ms[:-MAX_PAUSE_SAMPLES]
+        else:
+            # The user resumed right after the server endpointed: that endpoint was premature
+            if (self.response_started_at is not None and not self.turn_flagged
+                    and now - self.response_started_at <= config.VAD_FALSE_ENDPOINT_WINDOW_SECONDS):
+                self.false_endpoints += 1
+            self.turns += 1
+            self.in_user_turn = True
+            self.turn_flagged = False
+            self.response_started_at = None
+        self.last_chunk_time = now
+
+    def on_user_final(self, text: str):
+        """The final transcript of the user's turn; a dangling continuation word means it was cut short."""
+        words = (text or "").lower().rstrip(" .,!?").split()
+        if self.in_user_turn and not self.turn_flagged and words and words[-1] in CONTINUATION_WORDS:
+            self.false_endpoints += 1
+            self.turn_flagged = True
+
+    def on_response_start(self, now: Optional[float] = None):
+        """The model started answering (audio or a tool call), so the server endpointed the user's turn."""
+        if self.in_user_turn:
+            self.in_user_turn = False
+            self.response_started_at = now or time.time()
+
+    @property
+    def false_endpoint_rate(self) -> float:
+        return self.false_endpoints / self.turns if self.turns else 0.0
+
+    def recommend(self) -> dict:
+        """
+        Silence duration for this speaker's next session: just above their 90th-percentile pause, backed off when
+        they were cut off too often, moving at most VAD_MAX_ADJUST_MS from the current value.
+        """
+        current = self.silence_duration_ms
+        if self.turns < config.VAD_MIN_TURNS:
+            return {"silence_duration_ms": current, "end_of_speech_sensitivity": self.end_sensitivity}
+
+        p90 = _percentile(self.pauses_ms, 90)
+        desired = p90 + config.VAD_PAUSE_MARGIN_MS if p90 is not None else current - config.VAD_MAX_ADJUST_MS
+        if self.false_endpoint_rate > config.VAD_FALSE_ENDPOINT_TARGET:
+            desired = max(desired, current + config.VAD_MAX_ADJUST_MS)
+
+        step = _clamp(desired - current, -config.VAD_MAX_ADJUST_MS, config.VAD_MAX_ADJUST_MS)
+        silence = int(_clamp(current + step, config.VAD_SILENCE_MIN_MS, config.VAD_SILENCE_MAX_MS))
+
+        # Quick endpointing only for speakers who are rarely cut off
+        eager = (silence <= config.VAD_HIGH_SENSITIVITY_MAX_MS
+                 and self.false_endpoint_rate <= config.VAD_FALSE_ENDPOINT_TARGET)
+        return {
+            "silence_duration_ms": silence,
+            "end_of_speech_sensitivity": "END_SENSITIVITY_HIGH" if eager else "END_SENSITIVITY_LOW",
+        }
+
+    def realtime_input_config(self) -> types.RealtimeInputConfig:
+        return types.RealtimeInputConfig(
+            turn_coverage=types.TurnCoverage.TURN_INCLUDES_ALL_INPUT,
+            automatic_activity_detection=types.AutomaticActivityDetection(
+                start_of_speech_sensitivity=self.start_sensitivity,
+                end_of_speech_sensitivity=self.end_sensitivity,
+                prefix_padding_ms=self.prefix_padding_ms,
+                silence_duration_ms=self.silence_duration_ms,
+            ),
+        )
+
+    def report(self) -> dict:
+        """Measured behaviour, applied settings and the recommendation for the next session."""
+        p50 = _percentile(self.pauses_ms, 50)
+        p90 = _percentile(self.pauses_ms, 90)
+        return {
+            "turns": self.turns,
+            "false_endpoints": self.false_endpoints,
+            "false_endpoint_rate": round(self.false_endpoint_rate, 3),
+            "pause_p50_ms": round(p50) if p50 is not None else None,
+            "pause_p90_ms": round(p90) if p90 is not None else None,
+            "silence_duration_ms": self.silence_duration_ms,
+            "end_of_speech_sensitivity": self.end_sensitivity,
+            "saved_ms_per_turn": self.baseline_silence_ms - self.silence_duration_ms,
+            "recommended": self.recommend(),
+        }
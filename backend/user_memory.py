@@ -0,0 +1,206 @@
+"""
+Persistent cross-session user memory.
+A local SQLite store of user preferences (home airport, budget, airline, cabin), trip history and learned
+turn-taking settings, indexed by user, plus a compact profile rendered into the orchestrator's instruction at
+session start.
+Calls are blocking; run them off the event loop (asyncio.to_thread).
+"""
+
+import re
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional
+import config
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS preferences (
+    user_id TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (user_id, key)
+);
+CREATE TABLE IF NOT EXISTS trips (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id TEXT NOT NULL,
+    destination TEXT NOT NULL,
+    date TEXT,
+    flight TEXT,
+    airline TEXT,
+    price REAL,
+    currency TEXT,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_trips_user_created ON trips (user_id, created_at DESC);
+CREATE TABLE IF NOT EXISTS endpointing (
+    user_id TEXT PRIMARY KEY,
+    silence_duration_ms INTEGER NOT NULL,
+    end_of_speech_sensitivity TEXT NOT NULL,
+    turns INTEGER NOT NULL,
+    false_endpoints INTEGER NOT NULL,
+    updated_at REAL NOT NULL
+);
+"""
+
+PREFERENCE_LABELS = {
+    "home_airport": "Home airport",
+    "budget": "Budget",
+    "preferred_airline": "Preferred airline",
+    "cabin": "Preferred cabin",
+}
+
+AIRLINES = r"(ANA|JAL|Japan Airlines|All Nippon|United|Delta|American|Alaska|Southwest|JetBlue|Korean Air|Asiana|" \
+           r"Singapore Airlines|Cathay Pacific|Emirates|Qatar|Lufthansa|British Airways|Air France|KLM)"
+
+PREFERENCE_PATTERNS = {
+    # Case-insensitive lead-in, case-sensitive capture (airport codes / proper names only)
+    "home_airport": re.compile(
+        r"\b(?i:home airport is|i(?:'m| am)? (?:flying|fly|leaving|departing) (?:from|out of)|i live near|"
+        r"based (?:in|near))\s+"
+        r"([A-Z]{3}\b|[A-Z][a-z]+(?:\s[A-Z][a-z]+)?)"
+    ),
+    # Only amounts that are clearly money: "budget is 900", "under $900", "below 900 dollars"
+    "budget": re.compile(
+        r"\b(?:budget (?:is|of)(?: about| around)?\s*\$?\s?(\d[\d,]*)"
+        r"|(?:under|less than|below|no more than|up to|max(?:imum)? of)\s*"
+        r"(?:\$\s?(\d[\d,]*)|(\d[\d,]*)\s*(?:dollars|usd|bucks)\b))",
+        re.IGNORECASE
+    ),
+    "preferred_airline": re.compile(
+        r"\b(?:i prefer|i like|i love|i always fly|i only fly|prefer flying|preferably)\s+(?:flying\s+)?(?:with\s+)?" + AIRLINES,
+        re.IGNORECASE
+    ),
+    "cabin": re.compile(
+        # "first" / "business" need a cabin noun ("I want first to check..." isn't a cabin)
+        r"\b(?:i prefer|i like|i always fly|i only fly|i want|i'd like)\s+(?:to fly\s+)?"
+        r"(?:(business|first)\s+(?:class|cabin)\b|(premium economy|economy)\b)",
+        re.IGNORECASE
+    ),
+}
+
+_init_lock = threading.Lock()
+_initialized_paths = set()
+
+
+def _connect(path: Optional[str] = None) -> sqlite3.Connection:
+    path = path or config.USER_MEMORY_DB_PATH
+    conn = sqlite3.connect(path, timeout=5)
+    with _init_lock:
+        if path not in _initialized_paths:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+            _initialized_paths.add(path)
+    return conn
+
+
+def extract_preferences(text: str) -> Dict[str, str]:
+    """Pulls stated preferences out of a user utterance (e.g. "my budget is $1000" -> {"budget": "$1000"})."""
+    found = {}
+    for key, pattern in PREFERENCE_PATTERNS.items():
+        match = pattern.search(text or "")
+        if not match:
+            continue
+        value = next(group for group in match.groups() if group).strip()
+        if key == "budget":
+            value = f"${value.replace(',', '')}"
+        elif key == "cabin":
+            value = value.lower()
+        found[key] = value
+    return found
+
+
+def save_preferences(user_id: str, preferences: Dict[str, str], path: Optional[str] = None):
+    if not preferences:
+        return
+    now = time.time()
+    with _connect(path) as conn:
+        conn.executemany(
+            "INSERT INTO preferences (user_id, key, value, updated_at) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT(user_id, key) DO UPDATE SET value = excluded.value, updated_at = excluded.updated_at",
+            [(user_id, key, value, now) for key, value in preferences.items()]
+        )
+
+
+def record_trip(user_id: str, destination: str, date: Optional[str], flight: Optional[dict] = None,
+                path: Optional[str] = None):
+    flight = flight or {}
+    with _connect(path) as conn:
+        conn.execute(
+            "INSERT INTO trips (user_id, destination, date, flight, airline, price, currency, created_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (user_id, destination, date, flight.get("flight"), flight.get("airline"), flight.get("price"),
+             flight.get("currency"), time.time())
+        )
+
+
+def load_user_memory(user_id: str, path: Optional[str] = None) -> dict:
+    """Loads a user's preferences and most recent trips (index lookups on user_id)."""
+    with _connect(path) as conn:
+        preferences = dict(conn.execute(
+            "SELECT key, value FROM preferences WHERE user_id = ? ORDER BY updated_at DESC", (user_id,)
+        ).fetchall())
+        trips = [
+            dict(zip(("destination", "date", "flight", "airline", "price", "currency"), row))
+            for row in conn.execute(
+                "SELECT destination, date, flight, airline, price, currency FROM trips "
+                "WHERE user_id = ? ORDER BY created_at DESC LIMIT ?", (user_id, config.USER_MEMORY_MAX_TRIPS)
+            ).fetchall()
+        ]
+    return {"preferences": preferences, "trips": trips}
+
+
+def load_endpointing(user_id: str, path: Optional[str] = None) -> Optional[dict]:
+    """The activity detection settings recommended at the end of this user's last session, if any."""
+    with _connect(path) as conn:
+        row = conn.execute(
+            "SELECT silence_duration_ms, end_of_speech_sensitivity FROM endpointing WHERE user_id = ?", (user_id,)
+        ).fetchone()
+    if row is None:
+        return None
+    return {"silence_duration_ms": row[0], "end_of_speech_sensitivity": row[1]}
+
+
+def save_endpointing(user_id: str, report: dict, path: Optional[str] = None):
+    """Stores a session's turn-taking recommendation (see turn_taking.EndpointTracker.report)."""
+    recommended = report["recommended"]
+    with _connect(path) as conn:
+        conn.execute(
+            "INSERT INTO endpointing (user_id, silence_duration_ms, end_of_speech_sensitivity, turns, "
+            "false_endpoints, updated_at) VALUES (?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT(user_id) DO UPDATE SET silence_duration_ms = excluded.silence_duration_ms, "
+            "end_of_speech_sensitivity = excluded.end_of_speech_sensitivity, turns = excluded.turns, "
+            "false_endpoints = excluded.false_endpoints, updated_at = excluded.updated_at",
+            (user_id, recommended["silence_duration_ms"], recommended["end_of_speech_sensitivity"],
+             report["turns"], report["false_endpoints"], time.time())
+        )
+
+
+def render_profile(memory: dict, max_chars: int = config.USER_MEMORY_MAX_CHARS) -> str:
+    """
+    Renders remembered facts for the instruction, most useful first (preferences, then recent trips),
+    stopping before max_chars. Returns "" when there's nothing to say.
+    """
+    lines = []
+    for key, label in PREFERENCE_LABELS.items():
+        if key in memory.get("preferences", {}):
+            lines.append(f"- {label}: {memory['preferences'][key]}")
+    for trip in memory.get("trips", []):
+        line = f"- Previously searched: {trip['destination']}"
+        if trip.get("date"):
+            line += f" ({trip['date']})"
+        if trip.get("flight"):
+            line += f", found {trip['flight']}"
+            if trip.get("price") is not None:
+                line += f" at {trip['price']:g} {trip.get('currency') or ''}".rstrip()
+        lines.append(line)
+
+    if not lines:
+        return ""
+
+    text = "WHAT YOU REMEMBER ABOUT THIS USER FROM EARLIER SESSIONS (use it; don't ask again):"
+    for line in lines:
+        if len(text) + len(line) + 1 > max_chars:
+            break
+        text += "\n" + line
+    return text
@@ -0,0 +1,101 @@
+"""
+Deferred startup for the backend.
+Heavy modules (google.adk, google.genai) and the agent graph are loaded by a background warm-up task
+instead of at import time, so the server can bind and report liveness immediately.
+"""
+
+import asyncio
+import importlib
+import time
+
+# Modules imported during warm-up, in dependency order
+WARMUP_MODULES = ("google.genai", "google.adk", "client_pool", "tools", "session_manager", "text_chat")
+
+_process_start = time.time()
+_state = {
+    "ready": False,
+    "error": None,
+    "started_at": None,
+    "ready_at": None,
+    "timings": {},
+}
+_task = None
+
+
+def warm_up():
+    """Imports heavy modules and builds the agent graph (blocking; run off the event loop)."""
+    _state["started_at"] = time.time()
+    for module in WARMUP_MODULES:
+        start = time.perf_counter()
+        importlib.import_module(module)
+        _state["timings"][f"import:{module}"] = time.perf_counter() - start
+
+    from agents import get_nomad_agent, get_text_agent
+    from subagents import get_flight_specialist, get_lifestyle_specialist
+    for name, build in (("nomad_agent", get_nomad_agent),
+                        ("text_agent", get_text_agent),
+                        ("flight_specialist", get_flight_specialist),
+                        ("lifestyle_specialist", get_lifestyle_specialist)):
+        start = time.perf_counter()
+        build()
+        _state["timings"][f"build:{name}"] = time.perf_counter() - start
+
+    # Create the shared HTTP clients (credentials, pools) ahead of the first call.
+    # Only the request/response models are pooled; the Live orchestrator uses its own websocket.
+    from client_pool import get_client
+    for pool in ("subagents", "text"):
+        start = time.perf_counter()
+        get_client(pool)
+        _state["timings"][f"client:{pool}"] = time.perf_counter() - start
+
+    # Map the precomputed snippet cache so the first acknowledgement plays from memory (skipped if never built)
+    import config
+    if config.AUDIO_CACHE_ENABLED:
+        from audio_cache import get_audio_cache
+        start = time.perf_counter()
+        try:
+            get_audio_cache()
+        except OSError as e:
+            print(f"WARNING: Audio snippet cache unavailable: {e}")
+        _state["timings"]["cache:audio"] = time.perf_counter() - start
+
+
+async def _run():
+    try:
+        await asyncio.to_thread(warm_up)
+        _state["ready"] = True
+        _state["ready_at"] = time.time()
+        print(f"INFO: Warm-up complete in {_state['ready_at'] - _state['started_at']:.2f}s "
+              f"({_state['ready_at'] - _process_start:.2f}s since process start)")
+    except Exception as e:
+        _state["error"] = str(e)
+        print(f"ERROR: Warm-up failed: {e}")
+        raise
+
+
+def start():
+    """Schedules the background warm-up task (idempotent)."""
+    global _task
+    if _task is None:
+        _task = asyncio.create_task(_run())
+    return _task
+
+
+async def wait_until_ready():
+    """Waits for warm-up to finish (starting it if needed). Raises if warm-up failed."""
+    await asyncio.shield(start())
+
+
+def is_ready() -> bool:
+    return _state["ready"]
+
+
+def status() -> dict:
+    report = {
+        "ready": _state["ready"],
+        "error": _state["error"],
+        "timings": {name: round(seconds, 4) for name, seconds in _state["timings"].items()},
+    }
+    if _state["ready_at"]:
+        report["time_to_ready"] = round(_state["ready_at"] - _process_start, 4)
+    return report
@@ -144,6 +144,18 @@ const ActivityLog = ({
   );
 };
 
+const USER_ID_KEY = "nomad_user_id";
+
+// Stable anonymous identity for this browser (lets the backend remember the user across sessions)
+const getUserId = () => {
+  let userId = localStorage.getItem(USER_ID_KEY);
+  if (!userId) {
+    userId = `web-${crypto.randomUUID()}`;
+    localStorage.setItem(USER_ID_KEY, userId);
+  }
+  return userId;
+};
+
 function App() {
   const [isConnected, setIsConnected] = useState(false);
   const [isRecording, setIsRecording] = useState(false);
@@ -157,12 +169,15 @@ function App() {
   const [activeTool, setActiveTool] = useState(null);
   const [toolLatency, setToolLatency] = useState(null);
   const [toolResult, setToolResult] = useState(null);
+  const [vadTuning, setVadTuning] = useState(null); // Server-applied (adaptive) activity detection report
 
   const [config, setConfig] = useState({
+    user_id: getUserId(), // Stable per browser so Nomad remembers preferences across sessions
     voice_name: "Aoede",
     vad_settings: {
       silence_duration_ms: 1000,
       prefix_padding_ms: 300,
+      adaptive: true, // Let the server use the silence duration it learned, until the slider is moved
     },
     proactive_audio: true,
     affective_dialog: true,
@@ -402,9 +417,28 @@ function App() {
             });
             setToolLatency(null);
             setToolResult(null);
+          } else if (data.type === "interrupted") {
+            // Barge-in: drop any buffered agent audio immediately, and the chunks still in flight
+            stopAudioPlayback();
+            audioIgnoreUntil.current = Date.now() + 500;
+            setActiveTool(null);
+          } else if (data.type === "subagent_progress") {
+            // Partial specialist results while the subagent is still running
+            const progress = data.progress || {};
+            if (progress.stage === "flight" && progress.flight) {
+              setFlightData(progress.flight);
+            } else if (progress.stage === "text" && progress.text) {
+              setToolResult((prev) => (prev ? prev + progress.text : progress.text));
+            }
           } else if (data.type === "subagent_complete") {
             setToolLatency(data.duration);
             setToolResult(data.result);
+            // Rich UI payload (the model only receives the compact result)
+            if (data.ui && data.ui.flights && data.ui.flights.length > 0) {
+              setFlightData(data.ui.flights[0]);
+            }
+          } else if (data.type === "vad_tuning") {
+            setVadTuning(data);
           } else if (data.type === "ttfb") {
             setTtfb(data.duration);
             setTtfbHistory((prev) => {
@@ -627,11 +661,19 @@ function App() {
                       vad_settings: {
                         ...config.vad_settings,
                         silence_duration_ms: parseInt(e.target.value),
+                        adaptive: false,
                       },
                     })
                   }
                   className="w-full h-1 bg-gray-700 rounded-lg appearance-none cursor-pointer accent-blue-500"
                 />
+                {vadTuning && (
+                  <p className="text-[10px] text-gray-500 font-mono">
+                    Applied {vadTuning.silence_duration_ms}ms · {vadTuning.false_endpoints}/
+                    {vadTuning.turns} cut off · next{" "}
+                    {vadTuning.recommended.silence_duration_ms}ms
+                  </p>
+                )}
               </div>
 
               <div className="space-y-2">